@@ -0,0 +1,54 @@
+"""
+Compare two JSON reports of the same benchmark, e.g. from before and after a commit.
+Exits with status 1 if any timing got worse by more than --threshold percent.
+
+    python benchmarks/compare.py before.json after.json --threshold 10
+"""
+import argparse
+import json
+
+def change_percent(name: str, before: float, after: float) -> float:
+    """
+    Get how much better (positive) or worse (negative) a result got, in percent
+    """
+    if before == 0:
+        return 0.0
+    change = 100 * (after - before) / before
+    # rates are better when higher, times and sizes when lower
+    return change if name.endswith("_per_sec") else -change
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=10.0, help="percent a result may get worse before it counts as a regression")
+    args = parser.parse_args()
+
+    with open(args.before) as file:
+        before = json.load(file)
+    with open(args.after) as file:
+        after = json.load(file)
+    if before.get("benchmark") != after.get("benchmark"):
+        raise SystemExit(f"Can't compare a {before.get('benchmark')} report with a {after.get('benchmark')} report")
+
+    print(f"{before.get('benchmark')}: {before.get('commit')} -> {after.get('commit')}")
+    regressions = 0
+    for size, results in after["sizes"].items():
+        old_results = before["sizes"].get(size)
+        if old_results is None:
+            continue
+        print(f"{int(size):,} rows")
+        for name, value in results.items():
+            if name not in old_results or not (name.endswith("_ms") or name.endswith("_per_sec") or name.endswith("_mb")):
+                continue
+            change = change_percent(name, old_results[name], value)
+            flag = ""
+            if change < -args.threshold:
+                flag = "  REGRESSION"
+                regressions += 1
+            print(f"  {name:<30}{old_results[name]:>14,}{value:>14,}{change:>+9.1f}%{flag}")
+    if regressions:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    main()
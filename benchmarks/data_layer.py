@@ -0,0 +1,158 @@
+"""
+Time the insert, edit, delete, full scan and search paths of DatabaseConnection on synthetic journals.
+
+Each size gets a fresh database file with the production profile. Results are written as JSON,
+compare two runs with benchmarks/compare.py.
+
+    python benchmarks/data_layer.py --sizes 1000 100000 1000000 --json results.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from faithwalk import PRODUCTION_PROFILE, DatabaseConnection, Entry, EntryFilter, EntrySort
+from datasets import fill_database, synthetic_entries
+
+def median_ms(function: Callable[[], object], repeat: int) -> float:
+    """
+    Get the median time of 'repeat' calls in milliseconds
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return round(1000 * statistics.median(times), 3)
+
+def rate(rows: int, seconds: float) -> float:
+    return round(rows / max(seconds, 1e-9), 1)
+
+def run_size(path: str, rows: int, operations: int, repeat: int) -> dict:
+    """
+    Fill a database with 'rows' entries and time every path on it
+    """
+    results: dict = {}
+    database = DatabaseConnection(PRODUCTION_PROFILE.replace(path=path))
+    generator = random.Random(rows)
+
+    start = time.perf_counter()
+    fill_database(database, rows)
+    results["bulk_insert_rows_per_sec"] = rate(rows, time.perf_counter() - start)
+
+    # single-row paths commit once per call, like the GUI does
+    new_entries = list(synthetic_entries(operations, seed=2))
+    start = time.perf_counter()
+    for entry in new_entries:
+        database.add_entry(entry)
+    results["add_entry_ms"] = round(1000 * (time.perf_counter() - start) / operations, 4)
+
+    entry_ids = [generator.randrange(1, rows + 1) for _ in range(operations)]
+    edits = [Entry("Edited", "2024-01-01", "Psalms", "Edited event", "23:1", 15, "Edited action", id=entry_id) for entry_id in entry_ids]
+    start = time.perf_counter()
+    for entry in edits:
+        database.edit_entry(entry)
+    results["edit_entry_ms"] = round(1000 * (time.perf_counter() - start) / operations, 4)
+
+    start = time.perf_counter()
+    database.edit_entries(edits)
+    results["edit_entries_rows_per_sec"] = rate(operations, time.perf_counter() - start)
+
+    start = time.perf_counter()
+    for entry in new_entries:
+        database.delete_entry(entry.id)
+    results["delete_entry_ms"] = round(1000 * (time.perf_counter() - start) / operations, 4)
+
+    start = time.perf_counter()
+    database.delete_entries(sorted(set(entry_ids)))
+    results["delete_entries_rows_per_sec"] = rate(len(set(entry_ids)), time.perf_counter() - start)
+    remaining = database.cursor.execute("SELECT count(*) FROM DailyBibleReading").fetchone()[0]
+
+    start = time.perf_counter()
+    scanned = sum(1 for _ in database.iter_entries(batch_size=5000))
+    results["iter_entries_rows_per_sec"] = rate(scanned, time.perf_counter() - start)
+    start = time.perf_counter()
+    scanned = len(database.get_entries())
+    results["get_entries_rows_per_sec"] = rate(scanned, time.perf_counter() - start)
+    if scanned != remaining:
+        raise Exception(f"Benchmark error: scanned {scanned} of {remaining} entries")
+
+    middle_id = rows // 2
+    # a sorted page that starts halfway, after the entry in the middle of the journal
+    middle_position = EntrySort("name", descending=True).position(database.get_entries_page(middle_id, 1)[0])
+    searches = {
+        "first_page": lambda: database.get_entries_page(-1, 200),
+        "middle_page": lambda: database.get_entries_page(middle_id, 200),
+        "name_page": lambda: database.get_entries_page(-1, 200, EntryFilter(name="Reader 7")),
+        "book_page": lambda: database.get_entries_page(-1, 200, EntryFilter(book="psalms")),
+        "date_range_page": lambda: database.get_entries_page(-1, 200, EntryFilter(date="2023-03-01..2023-03-31")),
+        "date_sorted_page": lambda: database.get_entries_sorted(EntrySort("date"), None, 200),
+        "name_sorted_middle_page": lambda: database.get_entries_sorted(EntrySort("name", descending=True), middle_position, 200),
+        "text_search_page": lambda: database.search_entries("shepherd covenant", 200),
+        "prefix_search_page": lambda: database.search_entries("cov*", 200),
+        "stats_per_person": database.minutes_per_person,
+        "reading_streaks": database.reading_streaks,
+    }
+    for name, search in searches.items():
+        results[f"{name}_ms"] = median_ms(search, repeat)
+
+    # the same entry again and again is served from the entry cache, ids spread over the journal mostly aren't
+    results["get_entry_cached_ms"] = median_ms(lambda: database.get_entry(middle_id), repeat)
+    lookup_ids = [generator.randrange(1, rows + 1) for _ in range(repeat * 200)]
+    start = time.perf_counter()
+    for entry_id in lookup_ids:
+        database.get_entry(entry_id)
+    results["get_entry_uncached_ms"] = round(1000 * (time.perf_counter() - start) / len(lookup_ids), 4)
+    results["get_entries_by_ids_ms"] = median_ms(lambda: database.get_entries_by_ids(generator.sample(range(1, rows + 1), 200)), repeat)
+
+    database.disconnect(commit=True)
+    results["file_mb"] = round(os.path.getsize(path) / 2**20, 2)
+    return results
+
+def git_commit() -> str | None:
+    """
+    Get the commit the benchmark ran on, if the tree is a git checkout
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 100000, 1000000], help="rows in each database")
+    parser.add_argument("--operations", type=int, default=1000, help="single-row adds, edits and deletes per size")
+    parser.add_argument("--repeat", type=int, default=20, help="runs of each search, the median is reported")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    report = {
+        "benchmark": "data_layer",
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "sizes": {},
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for rows in args.sizes:
+            results = run_size(os.path.join(directory, f"journal_{rows}.db"), rows, min(args.operations, rows), args.repeat)
+            report["sizes"][str(rows)] = results
+            print(f"{rows:,} rows")
+            for name, value in results.items():
+                print(f"  {name:<30}{value:>14,}")
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=2)
+
+if __name__ == "__main__":
+    main()
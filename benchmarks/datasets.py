@@ -0,0 +1,38 @@
+"""
+Synthetic journals for the benchmarks, the same seed always gives the same entries
+"""
+import itertools
+import os
+import random
+import sys
+from collections.abc import Iterator
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from faithwalk import DatabaseConnection, Entry
+
+NAMES = [f"Reader {number}" for number in range(25)]
+BOOKS = ["Genesis", "Exodus", "Psalms", "Proverbs", "Isaiah", "Matthew", "Mark", "Luke", "John", "Acts", "Romans", "1 Peter", "Revelation"]
+DATES = [f"2023-{month:02d}-{day:02d}" for month in range(1, 13) for day in range(1, 29)]
+WORDS = ["grace", "faith", "hope", "love", "mercy", "peace", "joy", "light", "truth", "shepherd", "covenant", "prayer"]
+
+def synthetic_entries(rows: int, seed: int = 1) -> Iterator[Entry]:
+    """
+    Generate 'rows' entries with repeating names, dates and books and a few searchable words each
+    """
+    generator = random.Random(seed)
+    for number in range(rows):
+        yield Entry(generator.choice(NAMES), generator.choice(DATES), generator.choice(BOOKS),
+            f"Event {number} {generator.choice(WORDS)}", f"Verse {number % 31}:{number % 17}", generator.randint(5, 90),
+            f"Action number {number} {generator.choice(WORDS)}")
+
+def fill_database(database: DatabaseConnection, rows: int, seed: int = 1, chunk_size: int = 50000) -> None:
+    """
+    Add 'rows' synthetic entries, a chunk at a time so a million rows don't have to fit in memory at once
+    """
+    entries = synthetic_entries(rows, seed)
+    while True:
+        chunk = list(itertools.islice(entries, chunk_size))
+        if not chunk:
+            break
+        with database.bulk_load():
+            database.add_entries(chunk)
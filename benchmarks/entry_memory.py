@@ -0,0 +1,77 @@
+"""
+Measure how many bytes each loaded Entry costs.
+
+Compares the original Entry (a plain class with a __dict__, every string a separate object)
+with the current one (__slots__, interned names/dates/books, built by the cursor's row_factory).
+
+    python benchmarks/entry_memory.py --rows 100000
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from faithwalk import DEFAULT_PROFILE, DatabaseConnection
+from datasets import fill_database
+
+class DictEntry:
+    """
+    Entry as it was before __slots__, kept here to compare against
+    """
+    def __init__(self, name, date, book_of_bible, main_character_or_event, standingout_verse, time_spent_min, practical_action, id=-1):
+        self.id = id
+        self.name = name
+        self.date = date
+        self.book_of_bible = book_of_bible
+        self.main_character_or_event = main_character_or_event
+        self.standingout_verse = standingout_verse
+        self.time_spent_min = time_spent_min
+        self.practical_action = practical_action
+
+def measure(load) -> tuple[int, int]:
+    """
+    Get (bytes still allocated, entry count) after calling load()
+    """
+    gc.collect()
+    tracemalloc.start()
+    entries = load()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    count = len(entries)
+    del entries
+    return current, count
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    database = DatabaseConnection(DEFAULT_PROFILE.replace(path=":memory:"))
+    fill_database(database, args.rows)
+
+    def load_before() -> list[DictEntry]:
+        rows = database.connection.execute("SELECT * FROM DailyBibleReading").fetchall()
+        return [DictEntry(row[1], row[2], row[3], row[4], row[5], row[6], row[7], id=row[0]) for row in rows]
+
+    before, count = measure(load_before)
+    after, _ = measure(database.get_entries)
+
+    results = {
+        "rows": count,
+        "bytes_per_entry_before": round(before / count, 1),
+        "bytes_per_entry_after": round(after / count, 1),
+        "saved_percent": round(100 * (before - after) / before, 1),
+    }
+    print(f"{count:,} entries")
+    print(f"before: {results['bytes_per_entry_before']:>8} bytes per entry")
+    print(f"after:  {results['bytes_per_entry_after']:>8} bytes per entry ({results['saved_percent']}% less)")
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+if __name__ == "__main__":
+    main()
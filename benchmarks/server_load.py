@@ -0,0 +1,138 @@
+"""
+Load test for 'faithwalk serve': many concurrent clients on one machine, reporting requests/sec and latency percentiles.
+
+Starts a server on a temporary database filled with synthetic entries, unless --url points at a running one.
+Clients are spread over several processes so the test itself isn't held back by one GIL.
+
+    python benchmarks/server_load.py --clients 64 --seconds 10 --write-percent 10
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from faithwalk import DEFAULT_PROFILE, DatabaseConnection, Entry, EntryFilter
+from faithwalk.client import RemoteDatabase
+from datasets import fill_database
+
+def run_client(url: str, token: str | None, rows: int, seconds: float, write_percent: int, seed: int, latencies: list[tuple[str, float]]) -> None:
+    """
+    Send requests one after another until 'seconds' have passed, appending (request kind, seconds) to 'latencies'
+    """
+    random.seed(seed)
+    database = RemoteDatabase(url, token=token)
+    last_id = max(rows, 1)
+    change_id = database.last_change_id()
+    deadline = time.perf_counter() + seconds
+    while True:
+        start = time.perf_counter()
+        if start >= deadline:
+            break
+        roll = random.randrange(100)
+        if roll < write_percent:
+            kind = "add"
+            entry = Entry(f"Reader {seed % 25}", "2024-01-01", "Psalms", "Load test", "23:1", 10, "")
+            database.add_entry(entry)
+            last_id = entry.id
+        elif roll < 60:
+            kind = "page"
+            database.get_entries_page(random.randrange(last_id), 50)
+        elif roll < 80:
+            kind = "search"
+            database.get_entries_page(-1, 50, EntryFilter(name=f"Reader {random.randrange(25)}"))
+        else:
+            kind = "changes"
+            change_id = database.changes_since(change_id).change_id
+        latencies.append((kind, time.perf_counter() - start))
+    database.disconnect()
+
+def run_process(url: str, token: str | None, rows: int, clients: int, seconds: float, write_percent: int, first_seed: int) -> list[tuple[str, float]]:
+    """
+    Run 'clients' client threads in this process and collect their latencies
+    """
+    latencies: list[tuple[str, float]] = []
+    threads = [threading.Thread(target=run_client, args=(url, token, rows, seconds, write_percent, first_seed + number, latencies)) for number in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+def start_server(path: str, readers: int, token: str | None) -> tuple[subprocess.Popen, str]:
+    """
+    Start 'faithwalk serve' on a free port and get the process and its address
+    """
+    # the token goes through the environment so it doesn't show up in the process list
+    environment = {name: value for name, value in os.environ.items() if name != "FAITHWALK_TOKEN"}
+    if token:
+        environment["FAITHWALK_TOKEN"] = token
+    process = subprocess.Popen([sys.executable, "-m", "faithwalk", "--database", path, "serve", "--port", "0", "--readers", str(readers)],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), stderr=subprocess.PIPE, text=True, env=environment)
+    line = process.stderr.readline()
+    if " on " not in line:
+        process.kill()
+        raise Exception(f"Server error: {line}{process.stderr.read()}")
+    return process, line.rsplit(" on ", 1)[1].strip()
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", help="test a running server instead of starting one")
+    parser.add_argument("--token", default=os.environ.get("FAITHWALK_TOKEN"), help="token of the server, defaults to $FAITHWALK_TOKEN")
+    parser.add_argument("--rows", type=int, default=100000, help="entries in the temporary database, or about how many the --url server has")
+    parser.add_argument("--readers", type=int, default=4, help="reader connections of the started server")
+    parser.add_argument("--clients", type=int, default=32)
+    parser.add_argument("--processes", type=int, default=4, help="processes the clients are spread over")
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--write-percent", type=int, default=10, help="share of requests that add an entry")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    server = None
+    directory = tempfile.TemporaryDirectory()
+    url = args.url
+    if not url:
+        path = os.path.join(directory.name, "load.db")
+        database = DatabaseConnection(DEFAULT_PROFILE.replace(path=path, journal_mode="WAL"))
+        fill_database(database, args.rows)
+        database.disconnect(commit=True)
+        server, url = start_server(path, args.readers, args.token)
+
+    try:
+        processes = max(1, min(args.processes, args.clients))
+        with multiprocessing.Pool(processes) as pool:
+            # the first clients of each process get one more thread when they don't divide evenly
+            jobs = [pool.apply_async(run_process, (url, args.token, args.rows, args.clients // processes + (number < args.clients % processes), args.seconds, args.write_percent, number * 1000))
+                for number in range(processes)]
+            latencies = [latency for job in jobs for latency in job.get()]
+    finally:
+        if server:
+            server.terminate()
+            server.wait()
+        directory.cleanup()
+
+    results = {"clients": args.clients, "seconds": args.seconds, "write_percent": args.write_percent, "requests": len(latencies),
+        "requests_per_second": round(len(latencies) / args.seconds, 1)}
+    print(f"{args.clients} clients, {len(latencies):,} requests in {args.seconds:g} seconds: {results['requests_per_second']:,.0f} requests/sec")
+    print(f"{'request':<10}{'count':>10}{'p50 ms':>10}{'p99 ms':>10}")
+    for kind in ["all", "page", "search", "changes", "add"]:
+        values = sorted(latency for latency_kind, latency in latencies if kind in ("all", latency_kind))
+        if not values:
+            continue
+        results[kind] = {"count": len(values), "p50_ms": round(1000 * percentile(values, 0.5), 2), "p99_ms": round(1000 * percentile(values, 0.99), 2)}
+        print(f"{kind:<10}{len(values):>10,}{results[kind]['p50_ms']:>10}{results[kind]['p99_ms']:>10}")
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+if __name__ == "__main__":
+    main()
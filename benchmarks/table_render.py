@@ -0,0 +1,156 @@
+"""
+Time how long the window takes to open and how fast the View tab builds and rebinds its rows.
+
+Needs a display; without $DISPLAY a virtual one is started with Xvfb. Results are written as JSON,
+compare two runs with benchmarks/compare.py.
+
+    python benchmarks/table_render.py --rows 100000 --json render.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from faithwalk import PRODUCTION_PROFILE, DatabaseConnection
+from datasets import fill_database
+from data_layer import git_commit
+
+def start_virtual_display() -> subprocess.Popen | None:
+    """
+    Start Xvfb on a free display number and point $DISPLAY at it, unless a display is already set
+    """
+    if os.environ.get("DISPLAY"):
+        return None
+    if not shutil.which("Xvfb"):
+        raise SystemExit("No display: set $DISPLAY or install Xvfb")
+    for number in range(99, 199):
+        if os.path.exists(f"/tmp/.X{number}-lock"):
+            continue
+        process = subprocess.Popen(["Xvfb", f":{number}", "-screen", "0", "1280x800x24", "-nolisten", "tcp"],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        # the display is ready once its socket exists
+        deadline = time.perf_counter() + 10
+        while time.perf_counter() < deadline and process.poll() is None:
+            if os.path.exists(f"/tmp/.X11-unix/X{number}"):
+                os.environ["DISPLAY"] = f":{number}"
+                return process
+            time.sleep(0.05)
+        process.kill()
+    raise SystemExit("Xvfb didn't start")
+
+def wait_until(window, condition: Callable[[], bool], timeout: float = 60.0) -> None:
+    """
+    Run the Tk event loop until 'condition' is true
+    """
+    deadline = time.perf_counter() + timeout
+    while not condition():
+        if time.perf_counter() > deadline:
+            raise Exception("Benchmark error: timed out waiting for the GUI")
+        window.update()
+        time.sleep(0.001)
+
+def median_ms(window, function: Callable[[], object], repeat: int) -> float:
+    """
+    Get the median time of 'repeat' calls in milliseconds, including drawing the result
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        window.update_idletasks()
+        times.append(time.perf_counter() - start)
+    return round(1000 * statistics.median(times), 3)
+
+def run(path: str, repeat: int, renderer: str = "widgets") -> dict:
+    """
+    Open the GUI on a filled database and time the table
+    """
+    from faithwalk import gui
+    # GUI.__init__ ends in mainloop, the benchmark runs the event loop itself instead
+    gui.Tk.Tk.mainloop = lambda self, n=0: None
+    # keep the once a second sync for changes by other programs out of the timings
+    gui.Table.SYNC_MS = 3600 * 1000
+    results: dict = {}
+
+    start = time.perf_counter()
+    window = gui.GUI(PRODUCTION_PROFILE.replace(path=path), renderer=renderer)
+    results["gui_construct_ms"] = round(1000 * (time.perf_counter() - start), 3)
+    table = window.view_table
+    wait_until(window.window, lambda: len(table.order) > 0 and not window.pending_calls)
+    results["first_page_shown_ms"] = round(1000 * (time.perf_counter() - start), 3)
+
+    # a second table on the same tab, to time Table on its own
+    start = time.perf_counter()
+    gui.Table(window)
+    window.window.update_idletasks()
+    results["table_construct_ms"] = round(1000 * (time.perf_counter() - start), 3)
+    wait_until(window.window, lambda: not window.pending_calls)
+    table = window.view_table
+
+    # rows are created once and reused, so their cost only matters when the canvas grows
+    rows_before = len(table.table_rows)
+    start = time.perf_counter()
+    table.grow_pool(rows_before + 50)
+    window.window.update_idletasks()
+    results["table_row_construct_ms"] = round(1000 * (time.perf_counter() - start) / 50, 4)
+    results["pool_rows"] = len(table.table_rows)
+    results["widgets_per_row"] = len(table.table_rows[0].widgets())
+
+    wait_until(window.window, lambda: not window.pending_calls)
+    results["refresh_unchanged_ms"] = median_ms(window.window, table.refresh, repeat)
+
+    def scroll_page() -> None:
+        # a page further down each time, including fetching entries that aren't loaded yet
+        table.on_scroll("scroll", "1", "pages")
+        wait_until(window.window, lambda: not window.pending_calls)
+    results["scroll_page_ms"] = median_ms(window.window, scroll_page, repeat)
+    results["scroll_one_row_ms"] = median_ms(window.window, lambda: table.on_scroll("scroll", "1", "units"), repeat)
+
+    window.on_closing()
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=100000, help="entries in the database")
+    parser.add_argument("--repeat", type=int, default=30, help="runs of each timing, the median is reported")
+    parser.add_argument("--renderer", choices=["widgets", "canvas"], default="widgets", help="how the View tab draws its rows")
+    parser.add_argument("--json", help="write the results to this file")
+    args = parser.parse_args()
+
+    display = start_virtual_display()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "journal.db")
+            database = DatabaseConnection(PRODUCTION_PROFILE.replace(path=path))
+            fill_database(database, args.rows)
+            database.disconnect(commit=True)
+            results = run(path, args.repeat, args.renderer)
+    finally:
+        if display:
+            display.terminate()
+            display.wait()
+
+    report = {
+        "benchmark": "table_render",
+        "renderer": args.renderer,
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "sizes": {str(args.rows): results},
+    }
+    print(f"{args.rows:,} rows, {args.renderer} renderer")
+    for name, value in results.items():
+        print(f"  {name:<30}{value:>14,}")
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(report, file, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+"""
+Faith Walk reading journal.
+The data layer is importable without Tk, the GUI lives in faithwalk.gui and is only loaded when started.
+"""
+from faithwalk.entry import Entry, EntryFilter, EntrySort, parse_date, parse_minutes
+from faithwalk.database import DEFAULT_PROFILE, PRODUCTION_PROFILE, ConnectionProfile, DatabaseConnection, EntryChanges
+
+__all__ = [
+    "Entry",
+    "EntryFilter",
+    "EntrySort",
+    "parse_date",
+    "parse_minutes",
+    "ConnectionProfile",
+    "DEFAULT_PROFILE",
+    "PRODUCTION_PROFILE",
+    "DatabaseConnection",
+    "EntryChanges",
+]
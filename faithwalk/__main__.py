@@ -0,0 +1,3 @@
+from faithwalk.cli import main
+
+main()
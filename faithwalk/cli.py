@@ -0,0 +1,182 @@
+"""
+Command line of Faith Walk. Only the data layer is imported up front so headless commands start fast,
+Tk and the import/export code are loaded by the commands that need them.
+"""
+import argparse
+import os
+import sys
+
+from faithwalk.database import PRODUCTION_PROFILE, ConnectionProfile, DatabaseConnection
+from faithwalk.entry import Entry, EntryFilter, EntrySort
+
+def print_entries(entries: list[Entry]) -> None:
+    """
+    Write entries to standard output as tab separated lines, id first
+    """
+    lines = [str(entry.id) + "\t" + "\t".join(entry.texts()).replace("\n", " ") for entry in entries]
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+
+def add_command(database: DatabaseConnection, args: argparse.Namespace) -> None:
+    entry = Entry(args.name, args.date, args.book, args.event, args.verse, args.minutes, args.action)
+    database.add_entry(entry)
+    database.commit()
+    print(entry.id)
+
+def sorted_page(database: DatabaseConnection, args: argparse.Namespace, entry_filter: EntryFilter | None) -> list[Entry]:
+    """
+    Get the page of entries asked for by --sort, --descending, --after and --limit
+    """
+    entry_sort = EntrySort(args.sort, args.descending)
+    if entry_sort.is_default():
+        return database.get_entries_page(args.after, args.limit, entry_filter)
+    after = None
+    if args.after != -1:
+        # a sorted page continues from the place of the entry with that id
+        entry = database.get_entry(args.after)
+        if entry is None:
+            raise SystemExit(f"No entry with id {args.after}")
+        after = entry_sort.position(entry)
+    return database.get_entries_sorted(entry_sort, after, args.limit, entry_filter)
+
+def list_command(database: DatabaseConnection, args: argparse.Namespace) -> None:
+    print_entries(sorted_page(database, args, None))
+
+def show_command(database: DatabaseConnection, args: argparse.Namespace) -> None:
+    print_entries(database.get_entries_by_ids(args.ids))
+
+def search_command(database: DatabaseConnection, args: argparse.Namespace) -> None:
+    print_entries(sorted_page(database, args, EntryFilter.parse(" ".join(args.terms))))
+
+def stats_command(database: DatabaseConnection, args: argparse.Namespace) -> None:
+    streaks = database.reading_streaks()
+    print("person\tminutes\tentries\tcurrent streak\tlongest streak")
+    for name, minutes, entries in database.minutes_per_person():
+        current, longest = streaks.get(name, (0, 0))
+        print(f"{name}\t{minutes}\t{entries}\t{current}\t{longest}")
+    print()
+    print("book\tminutes\tentries")
+    for book, minutes, entries in database.minutes_per_book():
+        print(f"{book}\t{minutes}\t{entries}")
+
+def import_command(database: DatabaseConnection, args: argparse.Namespace) -> None:
+    from faithwalk.transfer import import_entries
+    progress = lambda rows: print(f"{rows:,} rows", file=sys.stderr)
+    rows, seconds = import_entries(database, args.file, args.format, args.chunk_size, args.restart, on_progress=progress)
+    print(f"Imported {rows:,} entries in {seconds:.2f} seconds ({rows / max(seconds, 1e-9):,.0f} rows/sec)", file=sys.stderr)
+
+def export_command(database: DatabaseConnection, args: argparse.Namespace) -> None:
+    from faithwalk.transfer import export_entries
+    progress = lambda rows: print(f"{rows:,} rows", file=sys.stderr)
+    rows, seconds = export_entries(database, args.file, args.format, on_progress=progress)
+    print(f"Exported {rows:,} entries in {seconds:.2f} seconds ({rows / max(seconds, 1e-9):,.0f} rows/sec)", file=sys.stderr)
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="faithwalk", description="Faith Walk reading journal")
+    parser.add_argument("--database", default=PRODUCTION_PROFILE.path, help="path of the database file")
+    parser.add_argument("--server", help="use a journal shared by 'faithwalk serve' instead of the file, e.g. http://127.0.0.1:8765")
+    parser.add_argument("--token", default=os.environ.get("FAITHWALK_TOKEN"),
+        help="shared secret of 'serve' and --server, needed to serve beyond this computer; defaults to $FAITHWALK_TOKEN")
+    parser.add_argument("--profile", action="store_true", help="time the database calls and SQL and print a summary when done")
+    parser.add_argument("--trace", metavar="FILE", help="also write the timings as a Chrome trace file, implies --profile")
+    commands = parser.add_subparsers(dest="command")
+    gui_parser = commands.add_parser("gui", help="open the window (the default)")
+    gui_parser.add_argument("--renderer", choices=["widgets", "canvas"], default="widgets",
+        help="draw the View tab with a textbox per cell, or all rows on one canvas (much lighter for big windows)")
+
+    serve_parser = commands.add_parser("serve", help="share the database with other computers over HTTP")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="address to listen on, 0.0.0.0 for every network (needs --token)")
+    serve_parser.add_argument("--port", type=int, default=8765, help="0 picks a free port")
+    serve_parser.add_argument("--readers", type=int, default=4, help="number of reader connections")
+    serve_parser.add_argument("--log", action="store_true", help="print every request")
+
+    add_parser = commands.add_parser("add", help="add one entry and print its id")
+    add_parser.set_defaults(run=add_command)
+    add_parser.add_argument("--name", required=True)
+    add_parser.add_argument("--date", default="", help="e.g. 2024-03-01, 3/1/2024 or March 1; defaults to empty")
+    add_parser.add_argument("--book", default="")
+    add_parser.add_argument("--event", default="", help="main character or event")
+    add_parser.add_argument("--verse", default="", help="standing out verse")
+    add_parser.add_argument("--minutes", default="", help="time spent, e.g. 20 or 1.5 hours")
+    add_parser.add_argument("--action", default="", help="practical action")
+
+    list_parser = commands.add_parser("list", help="print entries as tab separated lines")
+    list_parser.set_defaults(run=list_command)
+    show_parser = commands.add_parser("show", help="print the entries with the given ids")
+    show_parser.set_defaults(run=show_command)
+    show_parser.add_argument("ids", type=int, nargs="+")
+    search_parser = commands.add_parser("search", help="print entries matching a search, e.g. name:Ann book:John grace")
+    search_parser.set_defaults(run=search_command)
+    search_parser.add_argument("terms", nargs="+")
+    for paged_parser in (list_parser, search_parser):
+        paged_parser.add_argument("--limit", type=int, default=100)
+        paged_parser.add_argument("--after", type=int, default=-1, help="only entries after the one with this id, for paging")
+        paged_parser.add_argument("--sort", choices=list(EntrySort.COLUMNS), default="id", help="column to sort by, id is the order entries were added in")
+        paged_parser.add_argument("--descending", action="store_true")
+
+    stats_parser = commands.add_parser("stats", help="print minutes and streaks per person and minutes per book")
+    stats_parser.set_defaults(run=stats_command)
+
+    import_parser = commands.add_parser("import", help="add the entries of a CSV or JSON Lines file")
+    import_parser.set_defaults(run=import_command)
+    import_parser.add_argument("file")
+    import_parser.add_argument("--format", choices=["csv", "jsonl"], help="defaults to the file extension")
+    import_parser.add_argument("--chunk-size", type=int, default=20000, help="rows per commit")
+    import_parser.add_argument("--restart", action="store_true", help="import the whole file again instead of resuming")
+
+    export_parser = commands.add_parser("export", help="write every entry to a CSV or JSON Lines file")
+    export_parser.set_defaults(run=export_command)
+    export_parser.add_argument("file", help="'-' for standard output")
+    export_parser.add_argument("--format", choices=["csv", "jsonl"], help="defaults to the file extension")
+    return parser
+
+def main(arguments: list[str] | None = None) -> None:
+    """
+    Run a command, or start the GUI when none is given
+    """
+    args = build_parser().parse_args(arguments)
+    profile = PRODUCTION_PROFILE.replace(path=args.database)
+    profiler = None
+    if args.profile or args.trace:
+        from faithwalk.profiling import Profiler
+        profiler = Profiler()
+    try:
+        run_command(args, profile, profiler)
+    finally:
+        if profiler:
+            print(profiler.format_summary(), file=sys.stderr)
+            if args.trace:
+                events = profiler.export_trace(args.trace)
+                print(f"Wrote {events:,} trace events to {args.trace}", file=sys.stderr)
+
+def run_command(args: argparse.Namespace, profile: ConnectionProfile, profiler) -> None:
+    """
+    Run the parsed command, 'profiler' is a faithwalk.profiling.Profiler or None.
+    The profiling module is only imported with --profile, to keep it out of the start up time.
+    """
+    if args.command in (None, "gui"):
+        # Tk is only imported for the window
+        from faithwalk.gui import GUI
+        # no command at all opens the window with the defaults
+        GUI(profile, args.server, profiler, getattr(args, "renderer", "widgets"), args.token)
+        return
+    if args.command == "serve":
+        from faithwalk.server import serve
+        serve(profile, args.host, args.port, args.readers, args.log, profiler, args.token)
+        return
+
+    if args.server:
+        from faithwalk.client import RemoteDatabase
+        database = RemoteDatabase(args.server, token=args.token)
+    else:
+        database = DatabaseConnection(profile)
+    if profiler:
+        from faithwalk.profiling import instrument_database
+        database = instrument_database(database, profiler)
+    try:
+        args.run(database, args)
+    finally:
+        if profiler and hasattr(database, "entry_cache"):
+            stats = database.entry_cache.stats()
+            print(f"entry cache: {stats['hits']:,} hits, {stats['misses']:,} misses, {stats['entries']:,} of {stats['size']:,} entries", file=sys.stderr)
+        database.disconnect()
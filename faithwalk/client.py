@@ -0,0 +1,231 @@
+"""
+Client for a journal shared by 'faithwalk serve', with the same methods as DatabaseConnection
+"""
+import http.client
+import json
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+from urllib.parse import urlencode, urlsplit
+
+from faithwalk.database import EntryChanges
+from faithwalk.entry import Entry, EntryFilter, EntrySort
+from faithwalk.transfer import entry_record, record_to_entry
+
+class RemoteDatabase:
+    def __init__(self, url: str, timeout: float = 30.0, token: str | None = None) -> None:
+        """
+        Connect to a journal server, e.g. 'http://127.0.0.1:8765', 'token' is the one the server was started with.
+        Like DatabaseConnection, an instance should only be used from one thread.
+        """
+        parts = urlsplit(url)
+        if parts.scheme != "http" or not parts.hostname:
+            raise Exception(f"Server error: '{url}' is not an http:// address")
+        self.url: str = url
+        self.connection: http.client.HTTPConnection | None = http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=timeout)
+        self.token: str | None = token
+        # rows per second of the last batch operation, measured by the server
+        self.last_batch_rate: float = 0.0
+        # add_entries and set_import_progress calls collected inside bulk_load
+        self.bulk: dict | None = None
+
+    def request(self, method: str, path: str, body: Any = None, **query) -> Any:
+        """
+        Send a request and get its decoded JSON response
+        """
+        if not self.connection:
+            raise Exception("Server error: Not connected to server")
+        if query:
+            path += "?" + urlencode({key: value for key, value in query.items() if value is not None})
+        data = None if body is None else json.dumps(body).encode()
+        headers = {"Content-Type": "application/json"} if data is not None else {}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        try:
+            self.connection.request(method, path, data, headers)
+        except (ConnectionError, http.client.HTTPException):
+            # the connection was closed before the request got through, e.g. by a server restart, so sending it again is safe
+            self.connection.close()
+            self.connection.request(method, path, data, headers)
+        try:
+            response = self.connection.getresponse()
+        except (ConnectionError, http.client.HTTPException):
+            self.connection.close()
+            # a write may have been committed before the connection dropped, sending it again could make it twice
+            if method != "GET":
+                raise Exception(f"Server error: the connection was lost during {method} {path}, the change may or may not have been made")
+            self.connection.request(method, path, data, headers)
+            response = self.connection.getresponse()
+        result = json.loads(response.read() or b"null")
+        if response.status != 200:
+            raise Exception(f"Server error: {result.get('error') if isinstance(result, dict) else response.reason}")
+        return result
+
+    @staticmethod
+    def filter_query(entry_filter: EntryFilter | None) -> dict:
+        """
+        Get the query parameters that describe a filter
+        """
+        entry_filter = entry_filter or EntryFilter()
+        return {"name": entry_filter.name, "date": entry_filter.date, "book": entry_filter.book, "text": entry_filter.text}
+
+    def schema_version(self) -> int:
+        return self.request("GET", "/schema-version")
+
+    @contextmanager
+    def bulk_load(self) -> Iterator["RemoteDatabase"]:
+        """
+        Collect add_entries and set_import_progress calls and send them in one request, the server runs them in a bulk_load.
+        The ids of the added entries aren't known until the block ends, and aren't filled in.
+        """
+        self.bulk = {"entries": [], "source": None, "rows_done": 0}
+        try:
+            yield self
+            bulk = self.bulk
+        finally:
+            self.bulk = None
+        result = self.request("POST", "/entries/bulk", bulk)
+        self.last_batch_rate = result["rate"]
+
+    def get_import_progress(self, source: str) -> int:
+        return self.request("GET", "/import-progress", source=source)
+
+    def set_import_progress(self, source: str, rows_done: int) -> None:
+        if self.bulk is not None:
+            self.bulk.update(source=source, rows_done=rows_done)
+        else:
+            self.request("PUT", "/import-progress", {"source": source, "rows_done": rows_done})
+
+    def commit(self) -> None:
+        """
+        Every request is committed by the server
+        """
+
+    def add_entry(self, entry: Entry) -> None:
+        entry.id = self.request("POST", "/entries", entry_record(entry))
+
+    def edit_entry(self, entry: Entry) -> None:
+        if entry.id == -1:
+            raise Exception("When editing database Entry, ID = -1")
+        self.request("PUT", f"/entries/{entry.id}", entry_record(entry))
+
+    def delete_entry(self, entry_id: int):
+        self.request("DELETE", f"/entries/{entry_id}")
+
+    def add_entries(self, entries: list[Entry]) -> int:
+        if self.bulk is not None:
+            self.bulk["entries"].extend(entry_record(entry) for entry in entries)
+            return len(entries)
+        result = self.request("POST", "/entries/batch", [entry_record(entry) for entry in entries])
+        for entry, entry_id in zip(entries, result["ids"]):
+            entry.id = entry_id
+        self.last_batch_rate = result["rate"]
+        return len(entries)
+
+    def edit_entries(self, entries: list[Entry]) -> int:
+        result = self.request("PUT", "/entries/batch", [entry_record(entry) for entry in entries])
+        self.last_batch_rate = result["rate"]
+        return result["count"]
+
+    def delete_entries(self, entry_ids: list[int]) -> int:
+        result = self.request("POST", "/entries/delete", entry_ids)
+        self.last_batch_rate = result["rate"]
+        return result["count"]
+
+    def apply_edit(self, slot: str, before: Entry | None, after: Entry | None, kind: str = "edit", clear_draft: bool = False) -> int:
+        result = self.request("POST", "/edits", {"slot": slot, "kind": kind, "clear_draft": clear_draft,
+            "before": None if before is None else entry_record(before), "after": None if after is None else entry_record(after)})
+        if after is not None:
+            # take the id and the normalized values the server stored, like DatabaseConnection.apply_edit changes 'after' in place.
+            # an undo only matches a row that still holds them
+            stored = record_to_entry(result["after"])
+            for name in Entry.__slots__:
+                setattr(after, name, getattr(stored, name))
+        return result["journal_id"]
+
+    def apply_deletes(self, slot: str, entries: list[Entry]) -> list[int]:
+        result = self.request("POST", "/edits/delete", {"slot": slot, "entries": [entry_record(entry) for entry in entries]})
+        self.last_batch_rate = result["rate"]
+        return result["journal_ids"]
+
+    def get_edit_journal(self, slot: str, limit: int = 1000) -> list[tuple[int, str, Entry | None, Entry | None]]:
+        return [(journal_id, kind, None if before is None else record_to_entry(before), None if after is None else record_to_entry(after))
+            for journal_id, kind, before, after in self.request("GET", "/edits", slot=slot, limit=limit)]
+
+    def save_draft(self, slot: str, draft: Entry) -> None:
+        self.request("PUT", "/drafts", {"slot": slot, "draft": entry_record(draft)})
+
+    def get_draft(self, slot: str) -> Entry | None:
+        record = self.request("GET", "/drafts", slot=slot)
+        return None if record is None else record_to_entry(record)
+
+    def delete_draft(self, slot: str) -> None:
+        self.request("DELETE", "/drafts", slot=slot)
+
+    def get_entry(self, entry_id: int) -> Entry | None:
+        record = self.request("GET", f"/entries/{entry_id}")
+        return None if record is None else record_to_entry(record)
+
+    def get_entries_by_ids(self, entry_ids: list[int]) -> list[Entry]:
+        return [record_to_entry(record) for record in self.request("POST", "/entries/lookup", entry_ids)]
+
+    def get_entries(self) -> list[Entry]:
+        return list(self.iter_entries())
+
+    def iter_entries(self, batch_size: int = 500) -> Iterator[Entry]:
+        """
+        Stream every entry, a page of 'batch_size' entries per request
+        """
+        after_id = -1
+        while True:
+            page = self.get_entries_page(after_id, batch_size)
+            yield from page
+            if len(page) < batch_size:
+                break
+            after_id = page[-1].id
+
+    def get_entries_page(self, after_id: int = -1, limit: int = 100, entry_filter: EntryFilter | None = None) -> list[Entry]:
+        records = self.request("GET", "/entries", after=after_id, limit=limit, **self.filter_query(entry_filter))
+        return [record_to_entry(record) for record in records]
+
+    def get_entries_sorted(self, entry_sort: EntrySort, after: tuple | None = None, limit: int = 100, entry_filter: EntryFilter | None = None) -> list[Entry]:
+        records = self.request("GET", "/entries/sorted", sort=entry_sort.column, descending=int(entry_sort.descending),
+            after=None if after is None else json.dumps(list(after)), limit=limit, **self.filter_query(entry_filter))
+        return [record_to_entry(record) for record in records]
+
+    def search_entries(self, search: str, limit: int = 100) -> list[Entry]:
+        return self.get_entries_page(-1, limit, EntryFilter.parse(search))
+
+    def last_change_id(self) -> int:
+        return self.request("GET", "/changes/last")
+
+    def prune_change_log(self, keep: int = 10000) -> None:
+        """
+        The server prunes the change log when it starts
+        """
+
+    def changes_since(self, change_id: int, entry_filter: EntryFilter | None = None) -> EntryChanges:
+        result = self.request("GET", "/changes", since=change_id, **self.filter_query(entry_filter))
+        return EntryChanges(result["change_id"], [record_to_entry(record) for record in result["entries"]], result["removed_ids"], result["reload"])
+
+    def minutes_per_person(self) -> list[tuple[str, int, int]]:
+        return [tuple(row) for row in self.request("GET", "/stats/people")]
+
+    def minutes_per_book(self) -> list[tuple[str, int, int]]:
+        return [tuple(row) for row in self.request("GET", "/stats/books")]
+
+    def reading_streaks(self) -> dict[str, tuple[int, int]]:
+        return {name: tuple(streak) for name, streak in self.request("GET", "/stats/streaks").items()}
+
+    def daily_totals(self, days: int = 30) -> list[tuple[str, int, int]]:
+        return [tuple(row) for row in self.request("GET", "/stats/daily", days=days)]
+
+    def weekly_totals(self, weeks: int = 12) -> list[tuple[str, int, int]]:
+        return [tuple(row) for row in self.request("GET", "/stats/weekly", weeks=weeks)]
+
+    def disconnect(self, commit: bool = False) -> None:
+        """
+        Close the connection to the server, 'commit' is accepted for DatabaseConnection compatibility
+        """
+        self.connection.close()
+        self.connection = None
@@ -0,0 +1,746 @@
+"""
+Connection to the journal database
+"""
+import collections
+import json
+import sqlite3
+import time
+from contextlib import contextmanager
+from collections.abc import Iterator
+
+from faithwalk.entry import Entry, EntryFilter, EntrySort
+from faithwalk.schema import MIGRATIONS, create_change_triggers, create_search_triggers, create_summary_triggers, summarize_entries
+
+class ConnectionProfile:
+    """
+    Settings used when opening a database connection, applied as SQLite pragmas
+    """
+    JOURNAL_MODES: tuple[str, ...] = ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF")
+    SYNCHRONOUS_LEVELS: tuple[str, ...] = ("OFF", "NORMAL", "FULL", "EXTRA")
+    TEMP_STORES: tuple[str, ...] = ("DEFAULT", "FILE", "MEMORY")
+
+    def __init__(self, path: str = 'Faith_Walk.db', journal_mode: str = "DELETE", synchronous: str = "FULL", cache_size: int = -2000, mmap_size: int = 0, temp_store: str = "DEFAULT", busy_timeout: float = 5.0) -> None:
+        # the defaults match the defaults of SQLite itself
+        self.path: str = path
+        self.journal_mode: str = journal_mode.upper()
+        self.synchronous: str = synchronous.upper()
+        # positive values are pages, negative values are KiB
+        self.cache_size: int = int(cache_size)
+        # bytes of the database file to memory-map, 0 turns memory-mapping off
+        self.mmap_size: int = int(mmap_size)
+        self.temp_store: str = temp_store.upper()
+        # seconds to wait for a lock held by another connection
+        self.busy_timeout: float = busy_timeout
+
+        # pragma values can't be passed as parameters, so only allow known values
+        if self.journal_mode not in self.JOURNAL_MODES:
+            raise Exception(f"Profile error: unknown journal_mode {journal_mode}")
+        if self.synchronous not in self.SYNCHRONOUS_LEVELS:
+            raise Exception(f"Profile error: unknown synchronous level {synchronous}")
+        if self.temp_store not in self.TEMP_STORES:
+            raise Exception(f"Profile error: unknown temp_store {temp_store}")
+
+    def replace(self, **changes) -> "ConnectionProfile":
+        """
+        Get a copy of the profile with some settings changed
+        """
+        settings = dict(path=self.path, journal_mode=self.journal_mode, synchronous=self.synchronous, cache_size=self.cache_size,
+            mmap_size=self.mmap_size, temp_store=self.temp_store, busy_timeout=self.busy_timeout)
+        settings.update(changes)
+        return ConnectionProfile(**settings)
+
+    def pragmas(self) -> list[str]:
+        """
+        Get the pragma statements that apply the profile to a connection
+        """
+        return [
+            f"PRAGMA journal_mode = {self.journal_mode}",
+            f"PRAGMA synchronous = {self.synchronous}",
+            f"PRAGMA cache_size = {self.cache_size}",
+            f"PRAGMA mmap_size = {self.mmap_size}",
+            f"PRAGMA temp_store = {self.temp_store}",
+        ]
+
+# SQLite's own settings
+DEFAULT_PROFILE = ConnectionProfile()
+# WAL lets readers run alongside a writer, NORMAL sync is safe with WAL and only syncs on checkpoints,
+# a 64 MiB page cache and 256 MiB of memory-mapped pages keep large scans out of read() calls
+PRODUCTION_PROFILE = ConnectionProfile(journal_mode="WAL", synchronous="NORMAL", cache_size=-65536, mmap_size=268435456, temp_store="MEMORY")
+
+class EntryChanges:
+    def __init__(self, change_id: int, entries: list[Entry], removed_ids: list[int], reload: bool = False) -> None:
+        """
+        Entries changed since a ChangeLog change_id, see DatabaseConnection.changes_since
+        """
+        # the newest change included, pass it to the next changes_since call
+        self.change_id: int = change_id
+        # inserted or updated entries, current values
+        self.entries: list[Entry] = entries
+        # ids of entries that were deleted or no longer match the filter
+        self.removed_ids: list[int] = removed_ids
+        # True if the changes couldn't be listed, everything has to be loaded again
+        self.reload: bool = reload
+
+class EntryCache:
+    def __init__(self, size: int = 10000) -> None:
+        """
+        Entries by id, the least recently used are dropped once there are more than 'size'.
+        The entries are shared with whoever gets them, so they shouldn't be changed.
+        """
+        self.size: int = size
+        self.entries: collections.OrderedDict[int, Entry] = collections.OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+        # PRAGMA data_version and newest ChangeLog change_id when the entries were last checked against the database
+        self.data_version: int = -1
+        self.change_id: int = 0
+
+    def get(self, entry_id: int) -> Entry | None:
+        entry = self.entries.get(entry_id)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.entries.move_to_end(entry_id)
+        return entry
+
+    def put(self, entry: Entry) -> None:
+        if self.size <= 0:
+            return
+        self.entries[entry.id] = entry
+        self.entries.move_to_end(entry.id)
+        while len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def discard(self, entry_ids: list[int]) -> None:
+        for entry_id in entry_ids:
+            self.entries.pop(entry_id, None)
+
+    def clear(self) -> None:
+        self.entries.clear()
+
+    def stats(self) -> dict[str, int | float]:
+        """
+        Get the number of cached entries, hits, misses and the share of lookups that were hits
+        """
+        lookups = self.hits + self.misses
+        return {"entries": len(self.entries), "size": self.size, "hits": self.hits, "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0}
+
+def journal_text(entry: Entry | None) -> str | None:
+    """
+    Turn an entry into the JSON stored in EditJournal, None stays None
+    """
+    return None if entry is None else json.dumps([entry.id, *entry.values()])
+
+def journal_entry(text: str | None) -> Entry | None:
+    """
+    Turn JSON stored in EditJournal back into the entry
+    """
+    return None if text is None else Entry.from_row(json.loads(text))
+
+class DatabaseConnection:
+    # changes_since asks for a reload when more entries than this have changed
+    MAX_CHANGES: int = 1000
+    # entries kept in memory by id, see get_entry
+    ENTRY_CACHE_SIZE: int = 10000
+    # what an EditJournal row can be
+    EDIT_KINDS: tuple[str, ...] = ("edit", "undo", "redo")
+    # WHERE clause matching a row that still has the values an entry was loaded with
+    UNCHANGED: str = " AND ".join(f"{column} IS ?" for column in ("name_row", "date_row", "book_row", "event_row", "verse_row", "time_row", "action_row"))
+
+    def __init__(self, profile: ConnectionProfile = PRODUCTION_PROFILE) -> None:
+        """
+        Open a database connection and manage it
+        """
+        self.profile: ConnectionProfile = profile
+        self.connection: sqlite3.Connection | None = sqlite3.connect(profile.path, timeout=profile.busy_timeout)
+        for pragma in profile.pragmas():
+            self.connection.execute(pragma)
+        self.cursor: sqlite3.Cursor = self.connection.cursor()
+        # cursor that returns Entry objects instead of tuples
+        self.entry_cursor: sqlite3.Cursor = self.connection.cursor()
+        self.entry_cursor.row_factory = Entry.row_factory
+        # how many transaction() blocks are currently open, commits are held back while > 0
+        self.transaction_depth: int = 0
+        # rows per second of the last batch operation
+        self.last_batch_rate: float = 0.0
+        # (PRAGMA data_version, total_changes, newest change_id) seen by the last changes_since call
+        self.change_stamp: tuple[int, int, int] = (-1, -1, -1)
+        # written through by this connection, checked against ChangeLog for other connections' writes
+        self.entry_cache: EntryCache = EntryCache(self.ENTRY_CACHE_SIZE)
+        # create or upgrade the tables
+        self.migrate()
+        # where the cache starts following ChangeLog
+        self.check_entry_cache()
+
+    def schema_version(self) -> int:
+        """
+        Get the number of migrations that have been applied to the database
+        """
+        return self.cursor.execute("PRAGMA user_version").fetchone()[0]
+
+    def migrate(self) -> None:
+        """
+        Apply the migrations the database doesn't have yet, each one in its own transaction
+        """
+        version = self.schema_version()
+        if version > len(MIGRATIONS):
+            raise Exception(f"Migration error: database version {version} is newer than this program ({len(MIGRATIONS)})")
+        for number, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+            with self.transaction():
+                migration(self.cursor)
+                self.cursor.execute(f"PRAGMA user_version = {number}")
+
+    @contextmanager
+    def transaction(self) -> Iterator["DatabaseConnection"]:
+        """
+        Group several operations into a single commit.
+        Everything inside the block is rolled back if an exception is raised.
+        """
+        if not self.connection: 
+            # raise an exception if not connected to the database
+            raise Exception("Transaction error: Not connected to database") 
+        if self.transaction_depth == 0 and not self.connection.in_transaction:
+            # begin explicitly, sqlite3 only begins on its own before INSERT/UPDATE/DELETE
+            self.cursor.execute("BEGIN")
+        self.transaction_depth += 1
+        try:
+            yield self
+        except BaseException:
+            self.transaction_depth -= 1
+            # only the outermost block decides what happens to the transaction
+            if self.transaction_depth == 0:
+                self.connection.rollback()
+                # entries written through inside the block were never stored
+                self.entry_cache.clear()
+            raise
+        self.transaction_depth -= 1
+        if self.transaction_depth == 0:
+            self.connection.commit()
+
+    @contextmanager
+    def bulk_load(self) -> Iterator["DatabaseConnection"]:
+        """
+        Transaction for adding a lot of entries quickly, only add_entry/add_entries should be used inside it.
+        The search index and ReadingSummary are updated once at the end instead of by a trigger per row.
+        """
+        with self.transaction():
+            last_id: int = self.cursor.execute("SELECT ifnull(max(id), -1) FROM DailyBibleReading").fetchone()[0]
+            # the triggers come back below, or with the rollback if anything fails
+            self.cursor.execute("DROP TRIGGER DailyBibleReading_fts_insert")
+            self.cursor.execute("DROP TRIGGER ReadingSummary_insert")
+            self.cursor.execute("DROP TRIGGER ChangeLog_insert")
+            yield self
+            # AUTOINCREMENT ids are always larger than every id before them
+            self.cursor.execute("""INSERT INTO DailyBibleReading_fts (rowid, event_row, verse_row, action_row)
+                SELECT id, event_row, verse_row, action_row FROM DailyBibleReading WHERE id > ?""", (last_id,))
+            summarize_entries(self.cursor, last_id)
+            # one reload marker instead of a change per row, older changes are covered by it
+            self.cursor.execute("INSERT INTO ChangeLog (entry_id) VALUES (NULL)")
+            self.cursor.execute("DELETE FROM ChangeLog WHERE change_id < last_insert_rowid()")
+            create_search_triggers(self.cursor)
+            create_summary_triggers(self.cursor)
+            create_change_triggers(self.cursor)
+
+    def get_import_progress(self, source: str) -> int:
+        """
+        Get how many rows of an import source are already in the database
+        """
+        row = self.cursor.execute("SELECT rows_done FROM ImportProgress WHERE source = ?", (source,)).fetchone()
+        return row[0] if row else 0
+
+    def set_import_progress(self, source: str, rows_done: int) -> None:
+        """
+        Record how many rows of an import source are in the database
+        """
+        self.cursor.execute("INSERT INTO ImportProgress (source, rows_done) VALUES (?, ?) ON CONFLICT (source) DO UPDATE SET rows_done = excluded.rows_done",
+            (source, rows_done)
+        )
+        self.commit()
+
+    def commit(self) -> None:
+        """
+        Commit changes, unless a transaction() block will commit them later
+        """
+        if self.transaction_depth == 0:
+            self.connection.commit()
+
+    def add_entry(self, entry: Entry) -> None:
+        """
+        Add an entry to the database
+        """
+        if not self.connection:
+            #raise an exception if not connected to the database, 
+            #could easily have a failsafe but it is best that we know there are errors
+            raise Exception("ADD entry error: Not connected to database") 
+        self.cursor.execute("INSERT into DailyBibleReading (name_row, date_row, book_row, event_row, verse_row, time_row, action_row) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            entry.normalize().values()
+        )
+
+        entry.id = self.cursor.lastrowid
+        self.cache_entry(entry)
+        
+        self.commit()
+
+    def edit_entry(self, entry: Entry) -> None:
+        """
+        Edit an entry in a database
+        """
+        if entry.id == -1:
+            raise Exception("When editing database Entry, ID = -1")
+        
+        self.cursor.execute("""
+        UPDATE DailyBibleReading
+        SET name_row = ?, date_row = ?, book_row = ?, event_row = ?, verse_row = ?, time_row = ?, action_row = ?
+        WHERE id = ?
+        """, entry.normalize().get()) 
+        if self.cursor.rowcount:
+            self.cache_entry(entry)
+
+        self.commit()
+
+    def delete_entry(self, entry_id: int):
+        """
+        Delete a row in the database using an ID
+        """
+        self.cursor.execute("DELETE FROM DailyBibleReading WHERE id = ?", (entry_id,))
+        self.entry_cache.discard([entry_id])
+        self.commit()
+
+    def add_entries(self, entries: list[Entry]) -> int:
+        """
+        Add many entries to the database with a single commit, returns how many were added
+        """
+        if not self.connection:
+            raise Exception("ADD entries error: Not connected to database") 
+        start = time.perf_counter()
+        with self.transaction():
+            self.cursor.executemany("INSERT into DailyBibleReading (name_row, date_row, book_row, event_row, verse_row, time_row, action_row) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [entry.normalize().values() for entry in entries]
+            )
+            # executemany doesn't set lastrowid, but rows inserted by one statement get consecutive ids
+            last_id: int = self.cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+        for offset, entry in enumerate(entries):
+            entry.id = last_id - len(entries) + 1 + offset
+        self.record_batch_rate(len(entries), start)
+        return len(entries)
+
+    def edit_entries(self, entries: list[Entry]) -> int:
+        """
+        Edit many entries in the database with a single commit, returns how many were edited
+        """
+        if not self.connection:
+            raise Exception("EDIT entries error: Not connected to database") 
+        if any(entry.id == -1 for entry in entries):
+            raise Exception("When editing database Entries, ID = -1")
+        start = time.perf_counter()
+        with self.transaction():
+            self.cursor.executemany("""
+            UPDATE DailyBibleReading
+            SET name_row = ?, date_row = ?, book_row = ?, event_row = ?, verse_row = ?, time_row = ?, action_row = ?
+            WHERE id = ?
+            """, [entry.normalize().get() for entry in entries])
+        # a batch is usually more than the cache should hold, so drop the old values instead of writing through
+        self.entry_cache.discard([entry.id for entry in entries])
+        self.record_batch_rate(len(entries), start)
+        return len(entries)
+
+    def delete_entries(self, entry_ids: list[int]) -> int:
+        """
+        Delete many rows in the database with a single commit, returns how many ids were given
+        """
+        if not self.connection:
+            raise Exception("DELETE entries error: Not connected to database") 
+        start = time.perf_counter()
+        with self.transaction():
+            self.cursor.executemany("DELETE FROM DailyBibleReading WHERE id = ?", [(entry_id,) for entry_id in entry_ids])
+        self.entry_cache.discard(entry_ids)
+        self.record_batch_rate(len(entry_ids), start)
+        return len(entry_ids)
+
+    def apply_edit(self, slot: str, before: Entry | None, after: Entry | None, kind: str = "edit", clear_draft: bool = False) -> int:
+        """
+        Make one change and append it to EditJournal in the same commit, returns its journal_id.
+        'before' is the entry as the caller loaded it, None adds 'after', an 'after' of None deletes 'before'.
+        An 'after' with an id and no 'before' is put back with that id, that's how a delete is undone.
+        'kind' is "edit", or "undo"/"redo" when walking back and forth through the journal.
+        """
+        if not self.connection:
+            raise Exception("Edit journal error: Not connected to database")
+        if kind not in self.EDIT_KINDS:
+            raise Exception(f"Edit journal error: unknown kind '{kind}'")
+        if before is None and after is None:
+            raise Exception("Edit journal error: nothing to change")
+        if before is not None and after is not None and before.id != after.id:
+            raise Exception(f"Edit journal error: entry {before.id} can't become entry {after.id}")
+        if kind == "edit" and after is not None:
+            # entries from the journal were normalized when they were first stored
+            after.normalize()
+        with self.transaction():
+            # the row has to still hold 'before', so an old undo can't overwrite somebody else's newer change.
+            # 'before' comes from the caller, checking it costs nothing extra
+            if before is None and after.id == -1:
+                self.add_entry(after)
+            elif before is None:
+                self.cursor.execute("INSERT into DailyBibleReading (id, name_row, date_row, book_row, event_row, verse_row, time_row, action_row) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (after.id, *after.values())
+                )
+                self.cache_entry(after)
+            elif after is None:
+                self.cursor.execute(f"DELETE FROM DailyBibleReading WHERE id = ? AND {self.UNCHANGED}", (before.id, *before.values()))
+                self.entry_cache.discard([before.id])
+            else:
+                self.cursor.execute(f"""
+                UPDATE DailyBibleReading
+                SET name_row = ?, date_row = ?, book_row = ?, event_row = ?, verse_row = ?, time_row = ?, action_row = ?
+                WHERE id = ? AND {self.UNCHANGED}
+                """, (*after.get(), *before.values()))
+                if self.cursor.rowcount:
+                    self.cache_entry(after)
+            if not self.cursor.rowcount:
+                raise Exception(f"Edit journal error: entry {before.id} was changed or deleted since it was loaded")
+            self.cursor.execute("INSERT INTO EditJournal (slot, kind, entry_id, before_entry, after_entry) VALUES (?, ?, ?, ?, ?)",
+                (slot, kind, (after or before).id, journal_text(before), journal_text(after))
+            )
+            journal_id: int = self.cursor.lastrowid
+            if clear_draft:
+                self.cursor.execute("DELETE FROM Draft WHERE slot = ?", (slot,))
+        return journal_id
+
+    def apply_deletes(self, slot: str, entries: list[Entry]) -> list[int]:
+        """
+        Delete many entries as loaded with a single commit, each through apply_edit so it can be undone on its own.
+        Nothing is deleted if any of them was changed since, returns their journal_ids
+        """
+        start = time.perf_counter()
+        with self.transaction():
+            journal_ids = [self.apply_edit(slot, entry, None) for entry in entries]
+        self.record_batch_rate(len(entries), start)
+        return journal_ids
+
+    def get_edit_journal(self, slot: str, limit: int = 1000) -> list[tuple[int, str, Entry | None, Entry | None]]:
+        """
+        Get the newest 'limit' rows of a slot's EditJournal as (journal_id, kind, before, after), oldest first
+        """
+        rows = self.cursor.execute("SELECT journal_id, kind, before_entry, after_entry FROM EditJournal WHERE slot = ? ORDER BY journal_id DESC LIMIT ?",
+            (slot, limit)
+        ).fetchall()
+        return [(journal_id, kind, journal_entry(before), journal_entry(after)) for journal_id, kind, before, after in reversed(rows)]
+
+    def save_draft(self, slot: str, draft: Entry) -> None:
+        """
+        Store the text of an entry being typed, as typed. 'draft.id' is the entry being edited, -1 for a new one
+        """
+        self.cursor.execute("""INSERT INTO Draft (slot, entry_id, name_row, date_row, book_row, event_row, verse_row, time_row, action_row)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (slot) DO UPDATE SET entry_id = excluded.entry_id, name_row = excluded.name_row, date_row = excluded.date_row,
+                book_row = excluded.book_row, event_row = excluded.event_row, verse_row = excluded.verse_row, time_row = excluded.time_row,
+                action_row = excluded.action_row, saved_at = datetime('now')""", (slot, draft.id, *draft.values())
+        )
+        self.commit()
+
+    def get_draft(self, slot: str) -> Entry | None:
+        """
+        Get the draft saved for a slot, None if there isn't one
+        """
+        row = self.cursor.execute("SELECT entry_id, name_row, date_row, book_row, event_row, verse_row, time_row, action_row FROM Draft WHERE slot = ?",
+            (slot,)
+        ).fetchone()
+        return None if row is None else Entry.from_row(row)
+
+    def delete_draft(self, slot: str) -> None:
+        self.cursor.execute("DELETE FROM Draft WHERE slot = ?", (slot,))
+        self.commit()
+
+    def record_batch_rate(self, row_count: int, start: float) -> None:
+        """
+        Store the rows per second of a batch operation that started at 'start'
+        """
+        elapsed = time.perf_counter() - start
+        self.last_batch_rate = row_count / elapsed if elapsed > 0 else 0.0
+
+    def cache_entry(self, entry: Entry) -> None:
+        """
+        Write an added or edited entry through to the cache, as a copy so the caller can keep changing theirs
+        """
+        self.entry_cache.put(Entry.from_row((entry.id, *entry.values())))
+
+    def check_entry_cache(self) -> None:
+        """
+        Drop cached entries that other connections changed, found through ChangeLog.
+        Costs one PRAGMA while nobody else writes.
+        """
+        cache = self.entry_cache
+        data_version = self.cursor.execute("PRAGMA data_version").fetchone()[0]
+        if data_version == cache.data_version:
+            return
+        last_change_id = self.last_change_id()
+        if cache.entries:
+            oldest_change_id = self.cursor.execute("SELECT ifnull(min(change_id), 0) FROM ChangeLog").fetchone()[0]
+            changed_ids = [row[0] for row in self.cursor.execute("SELECT DISTINCT entry_id FROM ChangeLog WHERE change_id > ? LIMIT ?",
+                (cache.change_id, cache.size + 1)
+            )]
+            # pruned, a bulk load, or more changes than are worth looking through
+            if oldest_change_id > cache.change_id + 1 or None in changed_ids or len(changed_ids) > cache.size:
+                cache.clear()
+            else:
+                cache.discard(changed_ids)
+        cache.data_version = data_version
+        cache.change_id = last_change_id
+
+    def get_entry(self, entry_id: int) -> Entry | None:
+        """
+        Get one entry by id, None if there isn't one. Recently used entries come from memory.
+        """
+        if not self.connection: 
+            # raise an exception if not connected to the database
+            raise Exception("GET entry error: Not connected to database") 
+        self.check_entry_cache()
+        entry = self.entry_cache.get(entry_id)
+        if entry is None:
+            entry = self.entry_cursor.execute("SELECT * FROM DailyBibleReading WHERE id = ?", (entry_id,)).fetchone()
+            if entry is not None:
+                self.entry_cache.put(entry)
+        return entry
+
+    def get_entries_by_ids(self, entry_ids: list[int]) -> list[Entry]:
+        """
+        Get the entries with the given ids in the same order, ids without an entry are left out.
+        Only the ids that aren't cached are read from the database, in one query.
+        """
+        if not self.connection: 
+            # raise an exception if not connected to the database
+            raise Exception("GET entries error: Not connected to database") 
+        self.check_entry_cache()
+        found: dict[int, Entry] = {}
+        missing: list[int] = []
+        for entry_id in entry_ids:
+            entry = self.entry_cache.get(entry_id)
+            if entry is None:
+                missing.append(entry_id)
+            else:
+                found[entry_id] = entry
+        # stay below SQLite's limit on the number of parameters
+        for start in range(0, len(missing), 500):
+            chunk = missing[start:start + 500]
+            self.entry_cursor.execute(f"SELECT * FROM DailyBibleReading WHERE id IN ({', '.join('?' * len(chunk))})", chunk)
+            for entry in self.entry_cursor.fetchall():
+                found[entry.id] = entry
+                self.entry_cache.put(entry)
+        return [found[entry_id] for entry_id in entry_ids if entry_id in found]
+
+    def get_entries(self) -> list[Entry]:
+        """
+        Get all rows in the database in the form of Entries
+        """
+        return list(self.iter_entries())
+
+    def iter_entries(self, batch_size: int = 500) -> Iterator[Entry]:
+        """
+        Stream all rows in the database as Entries, only holding 'batch_size' rows in memory at a time
+        """
+        if not self.connection: 
+            # raise an exception if not connected to the database
+            raise Exception("GET entries error: Not connected to database") 
+        # use a separate cursor so other calls on self.cursor don't reset the stream
+        cursor = self.connection.cursor()
+        cursor.row_factory = Entry.row_factory
+        cursor.execute('SELECT * FROM DailyBibleReading ORDER BY id')
+        while True:
+            entries = cursor.fetchmany(batch_size)
+            if not entries:
+                break
+            yield from entries
+
+    def get_entries_page(self, after_id: int = -1, limit: int = 100, entry_filter: EntryFilter | None = None) -> list[Entry]:
+        """
+        Get up to 'limit' entries with an id greater than 'after_id', ordered by id.
+        Pass the id of the last entry of a page to get the next page.
+        Only entries matching 'entry_filter' are returned if one is given.
+        """
+        if not self.connection: 
+            # raise an exception if not connected to the database
+            raise Exception("GET entries error: Not connected to database") 
+        entry_filter = entry_filter or EntryFilter()
+        conditions, parameters = entry_filter.where()
+        id_column = entry_filter.id_column()
+        self.entry_cursor.execute(f'SELECT DailyBibleReading.* FROM {entry_filter.tables()} WHERE {" AND ".join([f"{id_column} > ?", *conditions])} ORDER BY {id_column} LIMIT ?',
+            (after_id, *parameters, limit)
+        )
+        entries = self.entry_cursor.fetchall()
+        # entries that were just shown are the ones most likely to be opened next
+        for entry in entries:
+            self.entry_cache.put(entry)
+        return entries
+
+    def get_entries_sorted(self, entry_sort: EntrySort, after: tuple | None = None, limit: int = 100, entry_filter: EntryFilter | None = None) -> list[Entry]:
+        """
+        Get up to 'limit' entries in the order of 'entry_sort', starting after the position 'after'.
+        Pass EntrySort.position of the last entry of a page to get the next page, None gets the first page.
+        Each page is a seek on the sort column's index, so a page deep into a sorted view costs the same as the first.
+        """
+        if not self.connection: 
+            # raise an exception if not connected to the database
+            raise Exception("GET entries error: Not connected to database") 
+        entry_filter = entry_filter or EntryFilter()
+        if entry_sort.is_default():
+            return self.get_entries_page(-1 if after is None else after[1], limit, entry_filter)
+        conditions, parameters = entry_filter.where()
+        direction = "DESC" if entry_sort.descending else "ASC"
+        compare = "<" if entry_sort.descending else ">"
+        expression = entry_sort.expression()
+        # each segment is (conditions, parameters, ORDER BY), read one after the other until the page is full
+        if entry_sort.column == "id":
+            id_column = entry_filter.id_column()
+            if after is None:
+                segments = [([], [], f"{id_column} {direction}")]
+            else:
+                segments = [([f"{id_column} {compare} ?"], [after[1]], f"{id_column} {direction}")]
+        else:
+            # (value, id) > (?, ?) is never true for a NULL value, so NULLs are paged on their own.
+            # NULLs sort first, so they come before the other values ascending and after them descending
+            value_order = f"{expression} {direction}, DailyBibleReading.id {direction}"
+            null_order = f"DailyBibleReading.id {direction}"
+            if after is None:
+                value_segment = ([f"{expression} IS NOT NULL"], [], value_order)
+                null_segment = ([f"{expression} IS NULL"], [], null_order)
+                segments = [value_segment, null_segment] if entry_sort.descending else [null_segment, value_segment]
+            elif after[0] is None:
+                segments = [([f"{expression} IS NULL", f"DailyBibleReading.id {compare} ?"], [after[1]], null_order)]
+                if not entry_sort.descending:
+                    segments.append(([f"{expression} IS NOT NULL"], [], value_order))
+            else:
+                # the row value alone isn't used to seek on an index with a collation, the plain comparison is
+                segments = [([f"{expression} {compare}= ?", f"({expression}, DailyBibleReading.id) {compare} (?, ?)"], [after[0], *after], value_order)]
+                if entry_sort.descending:
+                    segments.append(([f"{expression} IS NULL"], [], null_order))
+
+        entries: list[Entry] = []
+        for segment_conditions, segment_parameters, order_by in segments:
+            self.entry_cursor.execute(f"""SELECT DailyBibleReading.* FROM {entry_filter.tables()}
+                WHERE {" AND ".join([*segment_conditions, *conditions]) or "1"}
+                ORDER BY {order_by} LIMIT ?""",
+                (*segment_parameters, *parameters, limit - len(entries))
+            )
+            entries.extend(self.entry_cursor.fetchall())
+            if len(entries) >= limit:
+                break
+        for entry in entries:
+            self.entry_cache.put(entry)
+        return entries
+
+    def search_entries(self, search: str, limit: int = 100) -> list[Entry]:
+        """
+        Get the first 'limit' entries matching a search string, see EntryFilter.parse for the syntax
+        """
+        return self.get_entries_page(-1, limit, EntryFilter.parse(search))
+
+    def last_change_id(self) -> int:
+        """
+        Get the change_id of the newest change in ChangeLog, 0 if nothing has changed yet
+        """
+        return self.cursor.execute("SELECT ifnull(max(change_id), 0) FROM ChangeLog").fetchone()[0]
+
+    def prune_change_log(self, keep: int = 10000) -> None:
+        """
+        Forget all but the newest 'keep' changes, views that are further behind load everything again
+        """
+        self.cursor.execute("DELETE FROM ChangeLog WHERE change_id <= (SELECT max(change_id) FROM ChangeLog) - ?", (keep,))
+        self.commit()
+
+    def changes_since(self, change_id: int, entry_filter: EntryFilter | None = None) -> EntryChanges:
+        """
+        Get the entries inserted, updated or deleted by any connection after 'change_id'.
+        Only entries matching 'entry_filter' are returned, changed entries that don't match are listed as removed.
+        """
+        if not self.connection: 
+            # raise an exception if not connected to the database
+            raise Exception("Changes error: Not connected to database") 
+        # data_version only changes when another connection commits, total_changes when this one writes,
+        # so polling while nothing happens doesn't touch ChangeLog
+        data_version = self.cursor.execute("PRAGMA data_version").fetchone()[0]
+        if self.change_stamp[:2] == (data_version, self.connection.total_changes) and change_id >= self.change_stamp[2]:
+            return EntryChanges(change_id, [], [])
+        last_change_id = self.last_change_id()
+        self.change_stamp = (data_version, self.connection.total_changes, last_change_id)
+        if last_change_id <= change_id:
+            return EntryChanges(change_id, [], [])
+
+        oldest_change_id = self.cursor.execute("SELECT min(change_id) FROM ChangeLog").fetchone()[0]
+        changed_ids = [row[0] for row in self.cursor.execute("SELECT DISTINCT entry_id FROM ChangeLog WHERE change_id > ? AND change_id <= ? LIMIT ?",
+            (change_id, last_change_id, self.MAX_CHANGES + 1)
+        )]
+        # the changes were pruned, were too many or included a bulk load
+        if oldest_change_id > change_id + 1 or len(changed_ids) > self.MAX_CHANGES or None in changed_ids:
+            return EntryChanges(last_change_id, [], [], reload=True)
+
+        entry_filter = entry_filter or EntryFilter()
+        conditions, parameters = entry_filter.where()
+        self.entry_cursor.execute(f"""SELECT DailyBibleReading.* FROM {entry_filter.tables()}
+            WHERE {" AND ".join(["DailyBibleReading.id IN (SELECT entry_id FROM ChangeLog WHERE change_id > ? AND change_id <= ?)", *conditions])}
+            ORDER BY DailyBibleReading.id""", (change_id, last_change_id, *parameters)
+        )
+        entries = self.entry_cursor.fetchall()
+        found_ids = {entry.id for entry in entries}
+        return EntryChanges(last_change_id, entries, [entry_id for entry_id in changed_ids if entry_id not in found_ids])
+
+    def minutes_per_person(self) -> list[tuple[str, int, int]]:
+        """
+        Get (name, minutes, entries) for every person, most minutes first
+        """
+        return self.cursor.execute("""SELECT name_row, SUM(minutes), SUM(entries) FROM ReadingSummary
+            GROUP BY name_row ORDER BY 2 DESC""").fetchall()
+
+    def minutes_per_book(self) -> list[tuple[str, int, int]]:
+        """
+        Get (book, minutes, entries) for every book of the Bible, most minutes first
+        """
+        return self.cursor.execute("""SELECT book_row, SUM(minutes), SUM(entries) FROM ReadingSummary
+            GROUP BY book_row COLLATE NOCASE ORDER BY 2 DESC""").fetchall()
+
+    def reading_streaks(self) -> dict[str, tuple[int, int]]:
+        """
+        Get {name: (current streak, longest streak)} in days of reading in a row.
+        A streak is current if its last day is today or yesterday.
+        """
+        # dates minus their position in a person's sorted dates are equal for days in a row
+        rows = self.cursor.execute("""WITH days AS (
+                SELECT DISTINCT name_row, date_row FROM ReadingSummary WHERE date_row GLOB '[0-9][0-9][0-9][0-9]-[0-9][0-9]-[0-9][0-9]'
+            ), runs AS (
+                SELECT name_row, date_row, julianday(date_row) - ROW_NUMBER() OVER (PARTITION BY name_row ORDER BY date_row) AS run FROM days
+            ), streaks AS (
+                SELECT name_row, COUNT(*) AS length, MAX(date_row) AS last_day FROM runs GROUP BY name_row, run
+            )
+            SELECT name_row, MAX(CASE WHEN last_day >= date('now', 'localtime', '-1 day') THEN length ELSE 0 END), MAX(length)
+            FROM streaks GROUP BY name_row""").fetchall()
+        return {name: (current, longest) for name, current, longest in rows}
+
+    def daily_totals(self, days: int = 30) -> list[tuple[str, int, int]]:
+        """
+        Get (date, minutes, entries) for each day with entries in the last 'days' days
+        """
+        return self.cursor.execute("""SELECT date_row, SUM(minutes), SUM(entries) FROM ReadingSummary
+            WHERE date_row >= date('now', 'localtime', ?) AND date_row <= date('now', 'localtime')
+            GROUP BY date_row ORDER BY date_row""", (f"-{days} days",)).fetchall()
+
+    def weekly_totals(self, weeks: int = 12) -> list[tuple[str, int, int]]:
+        """
+        Get (week, minutes, entries) for each week with entries in the last 'weeks' weeks, weeks start on Monday
+        """
+        return self.cursor.execute("""SELECT strftime('%Y-W%W', date_row), SUM(minutes), SUM(entries) FROM ReadingSummary
+            WHERE date_row >= date('now', 'localtime', ?) AND date_row <= date('now', 'localtime')
+            GROUP BY 1 ORDER BY 1""", (f"-{weeks * 7} days",)).fetchall()
+
+    def disconnect(self, commit: bool = False) -> None:
+        """
+        Disconnect from the database
+        """
+        if not self.connection: 
+            # raise an exception if not connected to the database
+            raise Exception("Disconnect error: Not connected to database") 
+        if commit:
+            self.connection.commit()
+        self.connection.close()
+        self.connection = None
+        self.entry_cache.clear()
@@ -0,0 +1,323 @@
+"""
+Journal entries, parsing of typed-in values, and search filters
+"""
+import functools
+import re
+import shlex
+import sqlite3
+import sys
+from datetime import date, datetime
+
+def intern_text(value):
+    """
+    Share one string object between all equal values, used for columns that repeat a lot like names and books
+    """
+    return sys.intern(value) if type(value) is str else value
+
+class Entry:
+    """
+    Class that holds the data of a singular entry in a table 
+    """
+    # no per-instance __dict__, an entry is a fixed set of references
+    __slots__ = ("id", "name", "date", "book_of_bible", "main_character_or_event", "standingout_verse", "time_spent_min", "practical_action")
+
+    def __init__(self, name: str, date: str, book_of_bible: str, main_character_or_event: str, standingout_verse: str, time_spent_min: int | None, practical_action: str, id: int = -1) -> None:
+        self.id: int = id # -1 means not determined
+        self.name: str = name
+        self.date: str = date # ISO-8601 once normalized, e.g. 2023-12-02
+        self.book_of_bible: str = book_of_bible
+        self.main_character_or_event: str = main_character_or_event
+        self.standingout_verse: str = standingout_verse
+        self.time_spent_min: int | None = time_spent_min
+        self.practical_action: str = practical_action
+
+    #
+    def get(self) -> tuple:
+        """
+        Get the row in the form of a tuple, with the id last
+        """
+        return (self.name, self.date, self.book_of_bible, self.main_character_or_event, self.standingout_verse, self.time_spent_min, self.practical_action, self.id)
+
+    def values(self) -> tuple[str, ...]:
+        """
+        Get the data of the row without the id, in the column order of the database
+        """
+        return (self.name, self.date, self.book_of_bible, self.main_character_or_event, self.standingout_verse, self.time_spent_min, self.practical_action)
+
+    def texts(self) -> list[str]:
+        """
+        Get the data of the row without the id as strings for showing in textboxes
+        """
+        return ["" if value is None else str(value) for value in self.values()]
+
+    def normalize(self) -> "Entry":
+        """
+        Strip whitespace, turn the date into ISO-8601 and the time spent into minutes
+        """
+        # NULL columns of old journals stay NULL, like empty dates and minutes
+        self.name = strip_text(self.name)
+        self.date = parse_date(self.date)
+        self.book_of_bible = strip_text(self.book_of_bible)
+        self.main_character_or_event = strip_text(self.main_character_or_event)
+        self.standingout_verse = strip_text(self.standingout_verse)
+        self.time_spent_min = parse_minutes(self.time_spent_min)
+        self.practical_action = strip_text(self.practical_action)
+        return self
+
+    @classmethod
+    def from_row(cls, row: tuple) -> "Entry":
+        """
+        Create an entry from a DailyBibleReading row
+        """
+        # names, dates and books repeat across thousands of rows, so keep one copy of each
+        return cls(intern_text(row[1]), intern_text(row[2]), intern_text(row[3]), row[4], row[5], row[6], row[7], id=row[0])
+
+    @staticmethod
+    def row_factory(cursor: sqlite3.Cursor, row: tuple) -> "Entry":
+        """
+        Used as a cursor's row_factory so rows are turned into entries as they are fetched,
+        without first building a list of row tuples
+        """
+        return Entry.from_row(row)
+
+ISO_DATE = re.compile(r"\d{4}-\d{2}-\d{2}")
+# formats tried when a date isn't already ISO-8601, the ones without a year get the year added
+DATE_FORMATS: tuple[str, ...] = ("%m/%d/%Y", "%m/%d/%y", "%B %d %Y", "%b %d %Y", "%d %B %Y", "%d %b %Y", "%A %B %d %Y")
+DATE_FORMATS_WITHOUT_YEAR: tuple[str, ...] = ("%B %d", "%b %d", "%m/%d", "%A %B %d")
+# the whole text has to be one of these, "1:30" or "20-30" would otherwise lose everything after the first number
+MINUTES = re.compile(r"(\d+)\s*(?:m|min|mins|minute|minutes)?|(\d+(?:\.\d+)?)\s*(?:h|hr|hrs|hour|hours)", re.IGNORECASE | re.ASCII)
+
+def strip_text(text: str | None) -> str | None:
+    """
+    Strip whitespace from typed text, None stays None
+    """
+    return None if text is None else text.strip()
+
+def parse_date(text: str | None, today: date | None = None) -> str | None:
+    """
+    Turn a date typed by a user, like "November 12" or "12/2/2023", into ISO-8601.
+    Dates without a year are placed in the most recent year that doesn't put them in the future.
+    Text that can't be read as a date is returned stripped, so nothing typed is lost.
+    """
+    if text is None:
+        return None
+    text = text.strip()
+    if not text or ISO_DATE.fullmatch(text):
+        return text or None
+    return parse_date_text(text, today or date.today())
+
+@functools.lru_cache(maxsize=4096)
+def parse_date_text(text: str, today: date) -> str:
+    """
+    The slow part of parse_date, cached because imports repeat the same few hundred dates many times
+    """
+    # "December 2nd, 2023" -> "December 2 2023"
+    cleaned = re.sub(r"(\d)(st|nd|rd|th)\b", r"\1", text.replace(",", " "), flags=re.IGNORECASE)
+    cleaned = " ".join(cleaned.split())
+    for date_format in DATE_FORMATS:
+        try:
+            return datetime.strptime(cleaned, date_format).date().isoformat()
+        except ValueError:
+            pass
+    for date_format in DATE_FORMATS_WITHOUT_YEAR:
+        try:
+            # 2000 is a leap year, so February 29 is accepted
+            parsed = datetime.strptime(f"{cleaned} 2000", f"{date_format} %Y").date()
+        except ValueError:
+            continue
+        # go back from this year until the date isn't in the future and exists in that year
+        for year in range(today.year, today.year - 8, -1):
+            try:
+                candidate = parsed.replace(year=year)
+            except ValueError:
+                continue
+            if candidate <= today:
+                return candidate.isoformat()
+    return text
+
+def parse_minutes(text: str | int | None) -> int | str | None:
+    """
+    Turn a time spent typed by a user, like "22", "22 minutes" or "1.5 hours", into whole minutes.
+    Anything else, like "1:30" or "20-30", is returned stripped, so nothing typed is lost.
+    """
+    if text is None or isinstance(text, int):
+        return text
+    text = text.strip()
+    if not text:
+        return None
+    match = MINUTES.fullmatch(text)
+    if not match:
+        return text
+    if match.group(1):
+        return int(match.group(1))
+    return round(float(match.group(2)) * 60)
+
+class EntryFilter:
+    """
+    Conditions for searching the journal, conditions that are left empty match every entry
+    """
+    def __init__(self, name: str = "", date: str = "", book: str = "", text: str = "") -> None:
+        self.name: str = name
+        self.date: str = date
+        self.book: str = book
+        # words that have to appear in the event, verse or action text
+        self.text: str = text
+
+    @classmethod
+    def parse(cls, search: str) -> "EntryFilter":
+        """
+        Create a filter from a search box string.
+        'name:', 'date:' and 'book:' words filter those columns, quotes can be used for values with spaces,
+        dates can be given as a range like 'date:2023-12-01..2023-12-31',
+        all other words are searched for in the event, verse and action text.
+        """
+        try:
+            words = shlex.split(search)
+        except ValueError:
+            # unbalanced quotes, search for the words as they are
+            words = search.split()
+        entry_filter = cls()
+        text_words: list[str] = []
+        for word in words:
+            key, separator, value = word.partition(":")
+            if separator and key.lower() in ("name", "date", "book"):
+                setattr(entry_filter, key.lower(), value)
+            else:
+                text_words.append(word)
+        entry_filter.text = " ".join(text_words)
+        return entry_filter
+
+    def is_empty(self) -> bool:
+        """
+        Check if the filter matches every entry
+        """
+        return not (self.name or self.date or self.book or self.text)
+
+    def tables(self) -> str:
+        """
+        Get the FROM clause used to search with the filter
+        """
+        if self.text:
+            # drive the query from the search index, it returns matches in id order so LIMIT can stop it early
+            return "DailyBibleReading_fts JOIN DailyBibleReading ON DailyBibleReading.id = DailyBibleReading_fts.rowid"
+        return "DailyBibleReading"
+
+    def id_column(self) -> str:
+        """
+        Get the id column used for ordering and paging with the filter
+        """
+        return "DailyBibleReading_fts.rowid" if self.text else "DailyBibleReading.id"
+
+    def where(self) -> tuple[list[str], list[str]]:
+        """
+        Get the SQL conditions of the filter and their parameters
+        """
+        conditions: list[str] = []
+        parameters: list[str] = []
+        if self.name:
+            conditions.append("DailyBibleReading.name_row = ? COLLATE NOCASE")
+            parameters.append(self.name)
+        if self.date:
+            # 'date:2023-12-01..2023-12-31' is a range, either end can be left out
+            start, separator, end = self.date.partition("..")
+            if separator:
+                if start:
+                    conditions.append("DailyBibleReading.date_row >= ?")
+                    parameters.append(parse_date(start))
+                if end:
+                    conditions.append("DailyBibleReading.date_row <= ?")
+                    parameters.append(parse_date(end))
+            else:
+                conditions.append("DailyBibleReading.date_row = ?")
+                parameters.append(parse_date(self.date))
+        if self.book:
+            conditions.append("DailyBibleReading.book_row = ? COLLATE NOCASE")
+            parameters.append(self.book)
+        if self.text:
+            conditions.append("DailyBibleReading_fts MATCH ?")
+            parameters.append(self.match_expression())
+        return conditions, parameters
+
+    def match_expression(self) -> str:
+        """
+        Turn the search text into an FTS5 query where every word has to appear in the text.
+        A word ending in '*' matches every word starting with it.
+        """
+        # quote the words so characters like '-' or ':' aren't read as FTS5 syntax
+        terms: list[str] = []
+        for word in self.text.split():
+            prefix = word.endswith("*") and len(word) > 1
+            word = word.rstrip("*") if prefix else word
+            terms.append('"' + word.replace('"', '""') + '"' + ("*" if prefix else ""))
+        return " ".join(terms)
+
+# SQLite's NOCASE collation only folds ASCII letters
+NOCASE = str.maketrans("ABCDEFGHIJKLMNOPQRSTUVWXYZ", "abcdefghijklmnopqrstuvwxyz")
+
+class Descending:
+    """
+    Wraps a sort key so it orders the other way around
+    """
+    __slots__ = ("key",)
+
+    def __init__(self, key: tuple) -> None:
+        self.key: tuple = key
+
+    def __lt__(self, other: "Descending") -> bool:
+        return other.key < self.key
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, Descending) and other.key == self.key
+
+class EntrySort:
+    """
+    Order of the entries in a view, by one column and then by id so every entry has its own position
+    """
+    # column name -> (SQL column, collation, Entry attribute)
+    COLUMNS: dict[str, tuple[str, str, str]] = {
+        "id": ("DailyBibleReading.id", "", "id"),
+        "name": ("DailyBibleReading.name_row", " COLLATE NOCASE", "name"),
+        "date": ("DailyBibleReading.date_row", "", "date"),
+        "book": ("DailyBibleReading.book_row", " COLLATE NOCASE", "book_of_bible"),
+        "minutes": ("DailyBibleReading.time_row", "", "time_spent_min"),
+    }
+
+    def __init__(self, column: str = "id", descending: bool = False) -> None:
+        if column not in self.COLUMNS:
+            raise Exception(f"Sort error: can't sort by {column}")
+        self.column: str = column
+        self.descending: bool = bool(descending)
+
+    def is_default(self) -> bool:
+        """
+        Check if this is the order the entries were added in
+        """
+        return self.column == "id" and not self.descending
+
+    def expression(self) -> str:
+        """
+        Get the SQL expression sorted on, with the collation its index was created with
+        """
+        column, collation, attribute = self.COLUMNS[self.column]
+        return column + collation
+
+    def position(self, entry: Entry) -> tuple:
+        """
+        Get (value, id) of an entry, pass the position of the last entry of a page to get the next page
+        """
+        return (getattr(entry, self.COLUMNS[self.column][2]), entry.id)
+
+    def order_key(self, entry: Entry) -> tuple | Descending:
+        """
+        Get a key that orders entries the same way SQLite does: NULL, then numbers, then text
+        """
+        value, entry_id = self.position(entry)
+        if self.column == "id":
+            key: tuple = (entry_id,)
+        elif value is None:
+            key = (0, 0, entry_id)
+        elif isinstance(value, str):
+            key = (2, value.translate(NOCASE) if self.COLUMNS[self.column][1] else value, entry_id)
+        else:
+            key = (1, value, entry_id)
+        return Descending(key) if self.descending else key
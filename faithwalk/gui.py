@@ -0,0 +1,1628 @@
+"""
+Tk interface of Faith Walk
+"""
+import tkinter as Tk
+from tkinter import ttk, font, messagebox, filedialog
+import bisect
+import collections
+import enum
+import getpass
+import os
+import platform
+import textwrap
+import time
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any, Callable
+
+from faithwalk.database import PRODUCTION_PROFILE, ConnectionProfile, DatabaseConnection, EntryChanges
+from faithwalk.entry import Entry, EntryFilter, EntrySort
+from faithwalk.settings import load_settings, save_settings
+from faithwalk.transfer import export_entries, import_entries
+from faithwalk.worker import DatabaseWorker
+
+if TYPE_CHECKING:
+    from faithwalk.profiling import Profiler
+
+# make reference of GUI class so other classes depending on it can access
+class GUI:...
+
+def draft_slot() -> str:
+    """
+    Name the Update tab's draft and undo history are kept under, one per person and computer
+    """
+    try:
+        user = getpass.getuser()
+    except (KeyError, OSError):
+        user = "user"
+    return f"{user}@{platform.node()}"
+
+class DataType(enum.Enum):
+    NAME = 0
+    DATE = 1
+    BOOK = 2
+    EVENT = 3
+    VERSE = 4
+    TIME = 5
+    ACTION = 6
+
+class Table_Row:
+    def __init__(self, parent: Tk.Frame, row_index: int, parentGUIinstance: GUI) -> None:
+        """
+        Used for storing rows in the database viewing table.
+        The widgets are created once and then rebound to whichever Entry is scrolled into view.
+        """
+        self.row: Entry | None = None
+        # slot of this row inside the widget pool, never changes
+        self.row_index: int = row_index
+        self.text_boxes: dict[DataType, Tk.Text] = {}
+        # text currently in each textbox, so unchanged boxes aren't redrawn
+        self.shown_texts: dict[DataType, str] = {}
+        self.parentGUIinstance: GUI = parentGUIinstance
+
+        #
+        for column_index in range(7):
+            cell = Tk.Text(parent, width=12, height=3, wrap='word')
+            cell.grid(row=row_index, column=column_index, padx=1, pady=1)
+            cell.config(state=Tk.DISABLED)  # Make cells read-only if desired
+            self.text_boxes.update({DataType(column_index): cell})
+
+        #create edit and delete button
+        self.edit_button = Tk.Button(parent, text="Edit", width=9, height=2, command=self.edit_press)
+        self.delete_button = Tk.Button(parent, text="Delete", width=9, height=2, command=self.delete_press)
+
+        #set edit and delete buttons into the View Tab grid
+        self.edit_button.grid(row=row_index, column=7, padx=1, pady=1)
+        self.delete_button.grid(row=row_index, column=8, padx=1, pady=1)
+
+        #checkbox for selecting several rows to delete at once
+        self.selected = Tk.IntVar(parent, value=0)
+        self.select_button = Tk.Checkbutton(parent, variable=self.selected, command=self.select_press)
+        self.select_button.grid(row=row_index, column=9, padx=1, pady=1)
+
+    def widgets(self) -> list[Tk.Widget]:
+        """
+        Get every widget that makes up the row
+        """
+        return [*self.text_boxes.values(), self.edit_button, self.delete_button, self.select_button]
+
+    def column_widths(self) -> list[int]:
+        """
+        Get the width in pixels of each cell including its padding, for lining up the column headers
+        """
+        return [box.winfo_reqwidth() + 2 for box in self.text_boxes.values()]
+
+    def set_entry(self, row: Entry) -> None:
+        """
+        Bind the row widgets to an entry and show its values
+        """
+        self.row = row
+        values = row.texts()
+        for database_value in self.text_boxes:
+            self.show_text(database_value, values[database_value.value])
+        self.selected.set(1 if row.id in self.parentGUIinstance.view_table.selected_ids else 0)
+
+    def show(self) -> None:
+        """
+        Put the row back into the grid after it was hidden
+        """
+        for widget in self.widgets():
+            widget.grid()
+
+    def hide(self) -> None:
+        """
+        Take the row out of the grid, keeping the widgets for later reuse
+        """
+        self.row = None
+        for widget in self.widgets():
+            widget.grid_remove()
+
+    #edit button sends user to Update tab
+    def edit_press(self, *args) -> None:
+        """
+        Calls upon edit button being pressed.
+        """
+        self.parentGUIinstance.row_being_edited = self.row.id
+        self.parentGUIinstance.entry_being_edited = None
+        #sends user to Update Tab
+        self.parentGUIinstance.tabController.select(self.parentGUIinstance.changeDatabaseTab)
+        #edits the row as it is stored now, usually straight from the connection's entry cache
+        self.parentGUIinstance.run_in_background(None, "get_entry", self.row.id, on_done=self.parentGUIinstance.edit_row)
+
+    def select_press(self, *args) -> None:
+        """
+        Calls upon the select checkbox being toggled.
+        """
+        if self.selected.get():
+            self.parentGUIinstance.view_table.selected_ids.add(self.row.id)
+        else:
+            self.parentGUIinstance.view_table.selected_ids.discard(self.row.id)
+
+    #messagebox confirming deleting a row
+    def delete_press(self, *args) -> None:
+        """
+        Calls upon d button being pressed.
+        """
+        response = messagebox.askyesno("Confirm Deletion", "Are you sure you want to delete this entry?")
+    
+        if response:  # if clicks Yes
+            self.parentGUIinstance.view_table.delete_row(self.row.id)
+        # nothing happens if pressed No
+
+    def show_text(self, database_value: DataType, new_text: str) -> None:
+        """
+        Replace the text shown in a read-only textbox, if it is different
+        """
+        if self.shown_texts.get(database_value) == new_text:
+            return
+        self.shown_texts[database_value] = new_text
+        # using the database Type as the key, get the textbox
+        box = self.text_boxes[database_value]
+        box.config(state=Tk.NORMAL)
+        box.delete("1.0", Tk.END)
+        box.insert(Tk.END, new_text)
+        box.config(state=Tk.DISABLED)
+
+class Canvas_Row(Table_Row):
+    # characters per line and lines of text shown in a cell, the same as the textboxes of a Table_Row
+    CELL_CHARS: int = 12
+    CELL_LINES: int = 3
+    BUTTON_CHARS: int = 9
+    # pixels between cells and around the text inside them
+    GAP: int = 2
+    PADDING: int = 4
+
+    def __init__(self, canvas: Tk.Canvas, row_index: int, parentGUIinstance: GUI) -> None:
+        """
+        A row of the View tab drawn as canvas items instead of widgets, used by Table with renderer="canvas".
+        Edit and Delete work like Table_Row's, Table hit-tests clicks on the canvas and calls them.
+        """
+        self.row: Entry | None = None
+        # slot of this row inside the pool, never changes
+        self.row_index: int = row_index
+        self.canvas: Tk.Canvas = canvas
+        self.parentGUIinstance: GUI = parentGUIinstance
+        # text currently drawn in each cell, so unchanged cells aren't redrawn
+        self.shown_texts: dict[DataType, str] = {}
+        self.selected: bool = False
+        # every item of the row carries this tag, so the row is shown and hidden with one call
+        self.tag: str = f"row{row_index}"
+
+        cell_font = font.nametofont("TkFixedFont")
+        button_font = font.nametofont("TkDefaultFont")
+        self.row_height: int = self.CELL_LINES * cell_font.metrics("linespace") + 2 * self.PADDING + self.GAP
+        top = row_index * self.row_height
+        bottom = top + self.row_height - self.GAP
+        middle = (top + bottom) // 2
+
+        x = self.GAP
+        self.cell_width: int = self.CELL_CHARS * cell_font.measure("0") + 2 * self.PADDING
+        self.text_items: dict[DataType, int] = {}
+        for database_value in DataType:
+            canvas.create_rectangle(x, top, x + self.cell_width, bottom, fill="white", outline="gray70", tags=self.tag)
+            self.text_items[database_value] = canvas.create_text(x + self.PADDING, top + self.PADDING, anchor="nw", font=cell_font, tags=self.tag)
+            x += self.cell_width + self.GAP
+
+        # (left, right) of the clickable parts of the row, Table.on_canvas_click looks them up with action_at
+        button_width = self.BUTTON_CHARS * button_font.measure("0") + 2 * self.PADDING
+        self.actions: list[tuple[int, int, Callable[[], None]]] = []
+        for label, command in (("Edit", self.edit_press), ("Delete", self.delete_press)):
+            canvas.create_rectangle(x, top + self.PADDING, x + button_width, bottom - self.PADDING, fill="gray90", outline="gray50", tags=self.tag)
+            canvas.create_text(x + button_width // 2, middle, text=label, font=button_font, tags=self.tag)
+            self.actions.append((x, x + button_width, command))
+            x += button_width + self.GAP
+        box_size = button_font.metrics("linespace")
+        self.select_box: int = canvas.create_rectangle(x + self.PADDING, middle - box_size // 2, x + self.PADDING + box_size, middle + box_size // 2,
+            fill="white", outline="gray30", tags=self.tag)
+        self.actions.append((x, x + box_size + 2 * self.PADDING, self.select_press))
+        self.width: int = x + box_size + 2 * self.PADDING
+
+    def widgets(self) -> list[Tk.Widget]:
+        """
+        The row is drawn on the table's canvas, it has no widgets of its own
+        """
+        return []
+
+    def column_widths(self) -> list[int]:
+        return [self.cell_width + self.GAP + (self.GAP if index == 0 else 0) for index in range(len(self.text_items))]
+
+    def set_entry(self, row: Entry) -> None:
+        """
+        Bind the row to an entry and draw its values
+        """
+        self.row = row
+        values = row.texts()
+        for database_value in self.text_items:
+            self.show_text(database_value, values[database_value.value])
+        self.show_selected(row.id in self.parentGUIinstance.view_table.selected_ids)
+
+    def show(self) -> None:
+        self.canvas.itemconfigure(self.tag, state=Tk.NORMAL)
+
+    def hide(self) -> None:
+        self.row = None
+        self.canvas.itemconfigure(self.tag, state=Tk.HIDDEN)
+
+    def action_at(self, x: int) -> Callable[[], None] | None:
+        """
+        Get what a click at 'x' on this row does, None for the cells
+        """
+        for left, right, command in self.actions:
+            if left <= x <= right:
+                return command
+        return None
+
+    def select_press(self, *args) -> None:
+        """
+        Calls upon the select box being clicked.
+        """
+        self.show_selected(not self.selected)
+        if self.selected:
+            self.parentGUIinstance.view_table.selected_ids.add(self.row.id)
+        else:
+            self.parentGUIinstance.view_table.selected_ids.discard(self.row.id)
+
+    def show_selected(self, selected: bool) -> None:
+        if selected != self.selected:
+            self.selected = selected
+            self.canvas.itemconfigure(self.select_box, fill="gray20" if selected else "white")
+
+    def show_text(self, database_value: DataType, new_text: str) -> None:
+        """
+        Replace the text drawn in a cell, if it is different.
+        Text that doesn't fit is cut off after CELL_LINES lines like in a textbox.
+        """
+        if self.shown_texts.get(database_value) == new_text:
+            return
+        self.shown_texts[database_value] = new_text
+        lines = textwrap.wrap(new_text, self.CELL_CHARS, max_lines=self.CELL_LINES, placeholder="...") if len(new_text) > self.CELL_CHARS else [new_text]
+        self.canvas.itemconfigure(self.text_items[database_value], text="\n".join(lines))
+
+#############################VIEW TAB#########################################
+
+#create the table in the view tab
+class Table:
+    # number of entries fetched from the database at a time
+    PAGE_SIZE: int = 200
+    # column headers, the ones with an EntrySort column can be clicked to sort by them
+    HEADERS: dict[DataType, tuple[str, str | None]] = {
+        DataType.NAME: ("Name", "name"),
+        DataType.DATE: ("Date", "date"),
+        DataType.BOOK: ("Book", "book"),
+        DataType.EVENT: ("Event", None),
+        DataType.VERSE: ("Verse", None),
+        DataType.TIME: ("Minutes", "minutes"),
+        DataType.ACTION: ("Action", None),
+    }
+    # milliseconds between checks for changes made by other programs
+    SYNC_MS: int = 1000
+
+    def __init__(self, parentGUIinstance: GUI):
+        """
+        Creates a table which is used in the view database tab.
+        Only enough Table_Rows to fill the visible area are created, scrolling rebinds them to other entries.
+        With the GUI's renderer set to "canvas" the rows are Canvas_Rows drawn on the canvas instead.
+        """
+        self.parentGUIinstance = parentGUIinstance
+        self.row_class: type[Table_Row] = Canvas_Row if parentGUIinstance.renderer == "canvas" else Table_Row
+        # Create a toolbar above the table
+        self.toolbar = Tk.Frame(self.parentGUIinstance.viewDatabaseTab)
+        self.toolbar.pack(fill=Tk.X)
+        self.delete_selected_button = Tk.Button(self.toolbar, text="Delete Selected", command=self.delete_selected_press)
+        self.delete_selected_button.pack(side=Tk.RIGHT, padx=5, pady=2)
+
+        # search box, e.g. 'name:Ray book:Genesis creation'
+        self.search_label = Tk.Label(self.toolbar, text="Search")
+        self.search_box = Tk.Entry(self.toolbar, width=50)
+        self.search_button = Tk.Button(self.toolbar, text="Search", command=self.search_press)
+        self.clear_search_button = Tk.Button(self.toolbar, text="Clear", command=self.clear_search_press)
+        self.search_label.pack(side=Tk.LEFT, padx=5, pady=2)
+        self.search_box.pack(side=Tk.LEFT, pady=2)
+        self.search_button.pack(side=Tk.LEFT, padx=5, pady=2)
+        self.clear_search_button.pack(side=Tk.LEFT, pady=2)
+        self.search_box.bind("<Return>", self.search_press)
+
+        # clicking a header sorts by its column, clicking it again reverses the order, a third time goes back to the order entries were added in
+        self.header_frame = Tk.Frame(self.parentGUIinstance.viewDatabaseTab)
+        self.header_frame.pack(fill=Tk.X)
+        self.header_buttons: dict[str, Tk.Button] = {}
+        for database_value, (title, column) in self.HEADERS.items():
+            if column:
+                header = Tk.Button(self.header_frame, text=title, width=1, relief=Tk.FLAT, command=lambda column=column: self.sort_press(column))
+                self.header_buttons[column] = header
+            else:
+                header = Tk.Label(self.header_frame, text=title, width=1)
+            header.grid(row=0, column=database_value.value, sticky="ew")
+
+        # Create frame to hold the canvas and scrollbar
+        self.canvas_frame = Tk.Frame(self.parentGUIinstance.viewDatabaseTab)
+        self.canvas_frame.pack(fill=Tk.BOTH, expand=True)
+
+        # Create and pack the canvas
+        self.canvas = Tk.Canvas(self.canvas_frame)
+        self.canvas.pack(side=Tk.LEFT, fill=Tk.BOTH, expand=True)
+
+        # Create and pack the vertical scrollbar, it moves through the entries instead of the canvas
+        self.scrollbar = Tk.Scrollbar(self.canvas_frame, orient="vertical", command=self.on_scroll)
+        self.scrollbar.pack(side=Tk.RIGHT, fill=Tk.Y)
+
+        # Create a frame inside the canvas to hold the table
+        self.table_frame = Tk.Frame(self.canvas)
+        
+        # Add the table_frame to the canvas, Canvas_Rows are drawn on the canvas itself
+        if self.row_class is Table_Row:
+            self.canvas.create_window((0, 0), window=self.table_frame, anchor="nw")
+        else:
+            self.canvas.config(background="white", highlightthickness=0)
+            self.canvas.bind("<Button-1>", self.on_canvas_click)
+            self.canvas.bind("<Double-Button-1>", self.on_canvas_double_click)
+            self.canvas.bind("<Button-3>", self.on_canvas_menu)
+            # right-click menu of a row, menu_row is the row it was opened on
+            self.row_menu = Tk.Menu(self.canvas, tearoff=0)
+            self.row_menu.add_command(label="Edit", command=lambda: self.menu_row.edit_press())
+            self.row_menu.add_command(label="Delete", command=lambda: self.menu_row.delete_press())
+            self.row_menu.add_command(label="Select", command=lambda: self.menu_row.select_press())
+            self.menu_row: Table_Row | None = None
+
+        # ids of the entries ticked for deletion
+        self.selected_ids: set[int] = set()
+        # only entries matching the filter are shown
+        self.entry_filter: EntryFilter = EntryFilter()
+        # the sort picked last time this journal was open
+        try:
+            self.entry_sort: EntrySort = EntrySort(**load_settings(self.parentGUIinstance.journal).get("sort", {}))
+        except Exception:
+            self.entry_sort = EntrySort()
+        self.show_sort()
+        # fixed pool of rows, sized to the visible area of the canvas
+        self.table_rows: list[Table_Row] = []
+        # bumped on every reset, so pages requested before a reset are thrown away
+        self.generation: int = 0
+        # True while changes are being fetched, sync_again asks for another sync once they arrive
+        self.syncing: bool = False
+        self.sync_again: bool = False
+        # entries are fetched from the database a page at a time as the user scrolls
+        self.reset()
+
+        # rows look up the selection through the GUI while they are being bound
+        self.parentGUIinstance.view_table = self
+
+        # measure one row so we know how many fit on the canvas
+        self.grow_pool(1)
+        if self.row_class is Table_Row:
+            self.table_frame.update_idletasks()
+            self.row_height: int = max(self.table_frame.winfo_reqheight(), 1)
+        else:
+            self.row_height = self.table_rows[0].row_height
+        for index, width in enumerate(self.table_rows[0].column_widths()):
+            self.header_frame.columnconfigure(index, minsize=width)
+
+        # resize the pool whenever the canvas changes size
+        self.canvas.bind("<Configure>", self.on_canvas_configure)
+        self.bind_mousewheel(self.canvas)
+        self.refresh()
+        self.parentGUIinstance.window.after(self.SYNC_MS, self.poll_changes)
+
+    def reset(self) -> None:
+        """
+        Forget the loaded entries and load the first page again
+        """
+        # loaded entries, keyed by Entry.id
+        self.entries: dict[int, Entry] = {}
+        # display order of the loaded entries, deleted ids stay in their slot until the list is compacted
+        self.order: list[int] = []
+        # EntrySort.order_key of every id in self.order, self.order is sorted by it
+        self.sort_keys: dict[int, Any] = {}
+        # number of deleted ids still in self.order
+        self.deleted_slots: int = 0
+        # EntrySort.position and order_key of the last entry loaded, the next page starts after it
+        self.last_position: tuple | None = None
+        self.last_key: Any = None
+        self.fully_loaded: bool = False
+        # True while a page is being fetched by the database worker
+        self.loading: bool = False
+        # slot in self.order shown in the top row
+        self.first_index: int = 0
+        # newest ChangeLog change the table has applied, None until it is known
+        self.change_id: int | None = None
+        # True when reading the change_id failed, the next sync starts over
+        self.change_id_failed: bool = False
+        self.generation += 1
+        self.syncing = False
+        # the worker runs calls in order, so the change_id is read before the first page
+        generation = self.generation
+        self.parentGUIinstance.run_in_background(None, "last_change_id",
+            on_done=lambda change_id: self.change_id_loaded(change_id, generation),
+            on_error=lambda error: self.change_id_load_failed(generation)
+        )
+        self.load_more()
+
+    def change_id_loaded(self, change_id: int, generation: int) -> None:
+        """
+        Start syncing from the change_id the table was loaded at
+        """
+        if generation == self.generation:
+            self.change_id = change_id
+            if self.sync_again:
+                self.sync()
+
+    def change_id_load_failed(self, generation: int) -> None:
+        if generation == self.generation:
+            self.change_id_failed = True
+
+    def search_press(self, *args) -> None:
+        """
+        Calls upon the Search button being pressed or Return being hit in the search box.
+        """
+        self.entry_filter = EntryFilter.parse(self.search_box.get())
+        self.reset()
+        self.refresh()
+
+    def sort_press(self, column: str) -> None:
+        """
+        Calls upon a column header being clicked.
+        """
+        if self.entry_sort.column != column:
+            self.entry_sort = EntrySort(column)
+        elif not self.entry_sort.descending:
+            self.entry_sort = EntrySort(column, descending=True)
+        else:
+            self.entry_sort = EntrySort()
+        self.show_sort()
+        self.parentGUIinstance.save_setting("sort", {"column": self.entry_sort.column, "descending": self.entry_sort.descending})
+        # SQLite sorts, the table only loads the first page of the new order
+        self.reset()
+        self.refresh()
+
+    def show_sort(self) -> None:
+        """
+        Mark the header of the column the table is sorted by
+        """
+        for database_value, (title, column) in self.HEADERS.items():
+            if column in self.header_buttons:
+                arrow = (" \u25bc" if self.entry_sort.descending else " \u25b2") if column == self.entry_sort.column else ""
+                self.header_buttons[column].config(text=title + arrow)
+
+    def clear_search_press(self, *args) -> None:
+        """
+        Calls upon the Clear button being pressed.
+        """
+        self.search_box.delete(0, Tk.END)
+        self.search_press()
+
+    def visible_rows(self) -> int:
+        """
+        Number of rows that fit on the canvas
+        """
+        return len(self.table_rows)
+
+    def grow_pool(self, size: int) -> None:
+        """
+        Create Table_Rows until the pool has at least 'size' rows
+        """
+        profiler = self.parentGUIinstance.profiler
+        while len(self.table_rows) < size:
+            start = time.perf_counter()
+            table_row = self.row_class(self.table_frame if self.row_class is Table_Row else self.canvas, len(self.table_rows), self.parentGUIinstance)
+            for widget in table_row.widgets():
+                self.bind_mousewheel(widget)
+            self.table_rows.append(table_row)
+            if profiler:
+                profiler.record("tk", "Table_Row", start, time.perf_counter() - start)
+                profiler.count("widgets created", len(table_row.widgets()))
+
+    def bind_mousewheel(self, widget: Tk.Widget) -> None:
+        """
+        Scroll the table when the mouse wheel is used over a widget
+        """
+        widget.bind("<MouseWheel>", self.on_mousewheel)
+        widget.bind("<Button-4>", self.on_mousewheel)
+        widget.bind("<Button-5>", self.on_mousewheel)
+
+    def refresh(self) -> None:
+        """
+        Rebind the row pool to the entries starting at first_index
+        """
+        profiler = self.parentGUIinstance.profiler
+        if profiler:
+            with profiler.timed("tk", "Table.refresh"):
+                self.bind_rows()
+        else:
+            self.bind_rows()
+
+    def bind_rows(self) -> None:
+        """
+        Does the work of refresh
+        """
+        slot = self.first_index
+        empty_rows = 0
+        for table_row in self.table_rows:
+            # skip the slots of deleted entries
+            entry = None
+            while entry is None:
+                if slot >= len(self.order):
+                    # the rest of the rows are filled in when the next page arrives
+                    self.load_more()
+                    break
+                entry = self.entries.get(self.order[slot])
+                slot += 1
+
+            if entry is not None:
+                table_row.set_entry(entry)
+                table_row.show()
+            else:
+                table_row.hide()
+                empty_rows += 1
+
+        # after deleting near the bottom, move up so the last entries fill the table again
+        if empty_rows and self.first_index > 0 and self.fully_loaded:
+            slot = self.first_index
+            while empty_rows and slot > 0:
+                slot -= 1
+                if self.order[slot] in self.entries:
+                    empty_rows -= 1
+            self.first_index = slot
+            self.bind_rows()
+            return
+
+        # size the scrollbar slider to the part of the table that is visible
+        if len(self.order) == 0:
+            self.scrollbar.set(0, 1)
+        else:
+            self.scrollbar.set(self.first_index / len(self.order), min(1, slot / len(self.order)))
+
+    def load_more(self) -> None:
+        """
+        Ask the database worker for the next page of entries, unless one is on its way already
+        """
+        if self.loading or self.fully_loaded:
+            return
+        self.loading = True
+        generation = self.generation
+        self.parentGUIinstance.run_in_background("Loading entries", "get_entries_sorted", self.entry_sort, self.last_position, self.PAGE_SIZE, self.entry_filter,
+            on_done=lambda page: self.page_loaded(page, generation),
+            on_error=lambda error: self.page_failed(generation)
+        )
+
+    def page_failed(self, generation: int) -> None:
+        """
+        Let the next scroll ask for the page again after fetching it failed
+        """
+        if generation == self.generation:
+            self.loading = False
+
+    def page_loaded(self, page: list[Entry], generation: int) -> None:
+        """
+        Add a page of entries fetched by the database worker to the table
+        """
+        if generation != self.generation:
+            # the table was reset while the page was being fetched
+            return
+        self.loading = False
+        for entry in page:
+            if entry.id in self.sort_keys:
+                # matched the filter again after its slot was left behind, the page has its current place
+                self.remove_slot(entry.id)
+            self.entries[entry.id] = entry
+            self.sort_keys[entry.id] = self.entry_sort.order_key(entry)
+            self.order.append(entry.id)
+        if page:
+            self.last_position = self.entry_sort.position(page[-1])
+            self.last_key = self.sort_keys[page[-1].id]
+        self.fully_loaded = len(page) < self.PAGE_SIZE
+        self.refresh()
+        self.ensure_loaded(self.first_index + 2 * self.visible_rows())
+
+    def ensure_loaded(self, count: int) -> None:
+        """
+        Start loading the next page if fewer than 'count' slots are loaded
+        """
+        if len(self.order) < count:
+            self.load_more()
+
+    def compact(self) -> None:
+        """
+        Remove the slots of deleted entries from the display order
+        """
+        self.first_index = sum(1 for entry_id in self.order[:self.first_index] if entry_id in self.entries)
+        self.order = [entry_id for entry_id in self.order if entry_id in self.entries]
+        self.sort_keys = {entry_id: self.sort_keys[entry_id] for entry_id in self.order}
+        self.deleted_slots = 0
+        self.first_index = max(0, min(self.first_index, len(self.order) - self.visible_rows()))
+
+    def scroll_to(self, index: int) -> None:
+        """
+        Make the entry at slot 'index' the top row of the table
+        """
+        # keep a screen of entries loaded past the bottom row
+        self.ensure_loaded(index + 2 * self.visible_rows())
+        index = max(0, min(index, len(self.order) - self.visible_rows()))
+        if index != self.first_index:
+            self.first_index = index
+            self.refresh()
+
+    def poll_changes(self) -> None:
+        """
+        Sync every SYNC_MS, so changes made by other programs show up
+        """
+        self.sync()
+        self.parentGUIinstance.window.after(self.SYNC_MS, self.poll_changes)
+
+    def sync(self) -> None:
+        """
+        Apply the changes made to the database since the table was last synced
+        """
+        if self.change_id_failed:
+            # the pages may be older than a change_id read now, so load everything again
+            self.reset()
+            self.refresh()
+        if self.syncing or self.change_id is None:
+            # sync as soon as the running sync or the reset is done
+            self.sync_again = True
+            return
+        self.syncing = True
+        self.sync_again = False
+        generation = self.generation
+        self.parentGUIinstance.run_in_background(None, "changes_since", self.change_id, self.entry_filter,
+            on_done=lambda changes: self.apply_changes(changes, generation),
+            on_error=lambda error: self.sync_failed(generation)
+        )
+
+    def sync_failed(self, generation: int) -> None:
+        """
+        Let the next sync run after fetching the changes failed, e.g. while the server is restarting
+        """
+        if generation == self.generation:
+            self.syncing = False
+
+    def apply_changes(self, changes: EntryChanges, generation: int) -> None:
+        """
+        Patch the loaded entries with changes fetched by sync
+        """
+        if generation != self.generation:
+            # the table was reset while the changes were being fetched
+            return
+        self.syncing = False
+        if changes.reload:
+            self.reset()
+            self.refresh()
+            return
+        self.change_id = changes.change_id
+        if changes.entries or changes.removed_ids:
+            for entry in changes.entries:
+                key = self.entry_sort.order_key(entry)
+                if entry.id in self.sort_keys:
+                    if self.sort_keys[entry.id] == key:
+                        # still in the same place, removed entries keep their slot and can take it back
+                        if entry.id not in self.entries:
+                            self.deleted_slots -= 1
+                        self.entries[entry.id] = entry
+                        continue
+                    # the sorted column changed, move the entry
+                    self.remove_slot(entry.id)
+                if self.fully_loaded or (self.last_key is not None and not self.last_key < key):
+                    # new, moved or matching the filter again, self.order is sorted by sort_keys
+                    index = bisect.bisect_left(self.order, key, key=self.sort_keys.__getitem__)
+                    self.order.insert(index, entry.id)
+                    self.sort_keys[entry.id] = key
+                    self.entries[entry.id] = entry
+                    if index < self.first_index:
+                        self.first_index += 1
+                # entries past the loaded pages are picked up when their page is fetched
+            self.remove_rows(changes.removed_ids)
+        if self.sync_again:
+            self.sync()
+
+    def remove_slot(self, entry_id: int) -> None:
+        """
+        Take an entry's slot out of the display order, for moving the entry to another place
+        """
+        index = bisect.bisect_left(self.order, self.sort_keys[entry_id], key=self.sort_keys.__getitem__)
+        del self.order[index]
+        del self.sort_keys[entry_id]
+        if self.entries.pop(entry_id, None) is None:
+            self.deleted_slots -= 1
+        if index < self.first_index:
+            self.first_index -= 1
+
+    def delete_row(self, entry_id: int):
+        """
+        Delete a row from the table
+        """
+        entry = self.entries.get(entry_id)
+        if entry is None:
+            return
+        # delete from data base through the edit journal so it can be undone, the row is removed by the next sync
+        self.parentGUIinstance.record_edit("Deleting entry", entry, None)
+
+    def delete_selected_press(self, *args) -> None:
+        """
+        Calls upon the Delete Selected button being pressed.
+        """
+        if not self.selected_ids:
+            messagebox.showinfo("Delete Selected", "No entries are selected.")
+            return
+        response = messagebox.askyesno("Confirm Deletion", f"Are you sure you want to delete {len(self.selected_ids)} entries?")
+
+        if response:  # if clicks Yes
+            # the entries as shown, so the deletes can be undone and don't remove someone else's newer change
+            loaded = [self.entries[entry_id] for entry_id in self.selected_ids if entry_id in self.entries]
+            entry_ids = [entry_id for entry_id in self.selected_ids if entry_id not in self.entries]
+            self.parentGUIinstance.run_in_background(f"Deleting {len(self.selected_ids)} entries", self.delete_entries, self.parentGUIinstance.slot, loaded, entry_ids,
+                on_done=lambda result: self.entries_deleted(*result)
+            )
+
+    @staticmethod
+    def delete_entries(database: DatabaseConnection, slot: str, loaded: list[Entry], entry_ids: list[int]) -> tuple[list[Entry], float]:
+        """
+        Runs on the database worker, deletes entries through the edit journal and returns them with the rows per second.
+        Selected entries that aren't loaded any more, e.g. after a search, are looked up first
+        """
+        entries = loaded + database.get_entries_by_ids(entry_ids)
+        database.apply_deletes(slot, entries)
+        return entries, database.last_batch_rate
+
+    def entries_deleted(self, entries: list[Entry], rate: float) -> None:
+        """
+        Remove entries deleted by the Delete Selected button from the table, each one can be undone
+        """
+        self.parentGUIinstance.edits_recorded([(entry, None) for entry in entries])
+        messagebox.showinfo("Delete Selected", f"Deleted {len(entries)} entries ({rate:,.0f} rows/sec)")
+
+    def remove_rows(self, entry_ids: list[int]) -> None:
+        """
+        Remove entries that were deleted from the database, or no longer match the filter, from the table
+        """
+        # leave the slots in place, only the visible rows need to be rebound
+        for entry_id in entry_ids:
+            if self.entries.pop(entry_id, None) is not None:
+                self.deleted_slots += 1
+            self.selected_ids.discard(entry_id)
+        # compact once half of the slots are dead, so each delete costs O(1) on average
+        if self.deleted_slots > len(self.order) // 2:
+            self.compact()
+        self.refresh()
+
+    #create scrollbar
+    def on_scroll(self, action: str, amount: str, unit: str = "units") -> None:
+        # called by the scrollbar with either ("moveto", fraction) or ("scroll", steps, "units"/"pages")
+        if action == "moveto":
+            self.scroll_to(int(float(amount) * len(self.order)))
+        elif action == "scroll":
+            step = int(amount) * (self.visible_rows() if unit == "pages" else 1)
+            self.scroll_to(self.first_index + step)
+
+    def on_mousewheel(self, event: Tk.Event) -> str:
+        # Button-4/5 are used for the wheel on linux, <MouseWheel> everywhere else
+        if event.num == 4 or event.delta > 0:
+            self.scroll_to(self.first_index - 1)
+        else:
+            self.scroll_to(self.first_index + 1)
+        # stop the textbox from scrolling its own contents
+        return "break"
+
+    def row_at(self, y: int) -> Table_Row | None:
+        """
+        Get the Canvas_Row shown at 'y' on the canvas, None if no entry is shown there
+        """
+        index = int(self.canvas.canvasy(y)) // self.row_height
+        if 0 <= index < len(self.table_rows) and self.table_rows[index].row is not None:
+            return self.table_rows[index]
+        return None
+
+    def on_canvas_click(self, event: Tk.Event) -> None:
+        # hit-test the buttons of the Canvas_Row that was clicked
+        table_row = self.row_at(event.y)
+        command = table_row.action_at(int(self.canvas.canvasx(event.x))) if table_row else None
+        if command:
+            command()
+
+    def on_canvas_double_click(self, event: Tk.Event) -> None:
+        # double-clicking a cell edits the entry
+        table_row = self.row_at(event.y)
+        if table_row and not table_row.action_at(int(self.canvas.canvasx(event.x))):
+            table_row.edit_press()
+
+    def on_canvas_menu(self, event: Tk.Event) -> None:
+        self.menu_row = self.row_at(event.y)
+        if self.menu_row:
+            self.row_menu.tk_popup(event.x_root, event.y_root)
+
+    def on_canvas_configure(self, event: Tk.Event) -> None:
+        # add rows when the canvas gets taller, the extra row covers a partly visible one at the bottom
+        self.grow_pool(event.height // self.row_height + 1)
+        self.ensure_loaded(self.first_index + 2 * self.visible_rows())
+        self.refresh()
+
+class CreateEntryGUI:
+    def __init__(self, parentGUIinstance: GUI) -> None:
+        """
+        GUI for updating the 
+        """
+        self.parentGUIinstance: GUI = parentGUIinstance
+        self.left_frame = ttk.Frame(self.parentGUIinstance.changeDatabaseTab)
+        self.right_frame = ttk.Frame(self.parentGUIinstance.changeDatabaseTab)
+        self.top_frame = ttk.Frame(self.parentGUIinstance.changeDatabaseTab)
+        self.bottom_frame = ttk.Frame(self.parentGUIinstance.changeDatabaseTab)
+
+# use grid so the labels and textboxes can be packed side-by-side
+#----------------create a grid------------------
+        self.left_frame.grid(row=1, column=0, sticky="nsew")
+        self.right_frame.grid(row=1, column=1, sticky="nsew")
+        self.top_frame.grid(row=0, column=1, sticky="nsew")
+        self.bottom_frame.grid(row=2, column=1, sticky="nsew")
+
+#---------------TOP FRAME----------------------------
+        self.title_label = Tk.Label(self.top_frame, text='FAITH WALK', font=font.Font(size = 36))
+        self.subtitle_label = Tk.Label(self.top_frame, text='keeping track of your daily discipleship', font=font.Font(size = 13))
+
+        self.title_label.pack()
+        self.subtitle_label.pack()
+
+        #create variable for font size in order to change easily
+        self.label_size: font = font.Font(size=17)
+
+#-----------------RIGHT FRAME--------------------------
+        self.name_label = ttk.Label(self.left_frame, text='NAME ', font=self.label_size, width=7)
+        self.date_label = ttk.Label(self.left_frame, text='DATE ', font=self.label_size, width=7)
+        self.book_label = ttk.Label(self.left_frame, text='BOOK ', font=self.label_size, width=7)
+        self.event_label = ttk.Label(self.left_frame, text='EVENT ', font=self.label_size, width=7)
+        self.verse_label = ttk.Label(self.left_frame, text='VERSE ', font=self.label_size, width=7)
+        self.time_label = ttk.Label(self.left_frame, text='MINUTE ', font=self.label_size, width=7)
+        self.action_label = ttk.Label(self.left_frame, text='ACTION ', font=self.label_size, width=7)
+
+        #pack the labels into the right frame
+        self.name_label.pack(padx=10)
+        self.date_label.pack(padx=10, pady=4)
+        self.book_label.pack(padx=10, pady=4)
+        self.event_label.pack(padx=10, pady=4)
+        self.verse_label.pack(padx=10, pady=4)
+        self.time_label.pack(padx=10, pady=4)
+        self.action_label.pack(padx=10, pady=4)
+
+#-------------------LEFT FRAME-----------------
+        #create textbox widgets
+        self.name_box = Tk.Text(self.right_frame, width=90, height=2)
+        self.date_box = Tk.Text(self.right_frame, width=90, height=2)
+        self.book_box = Tk.Text(self.right_frame, width=90, height=2)
+        self.event_box = Tk.Text(self.right_frame, width=90, height=2)
+        self.verse_box = Tk.Text(self.right_frame, width=90, height=2)
+        self.time_box = Tk.Text(self.right_frame, width=90, height=2)
+        self.action_box = Tk.Text(self.right_frame, width=90, height=2)
+
+        #save a draft of what is typed, see GUI.draft_modified
+        for box in self.textboxes():
+            box.bind("<<Modified>>", self.parentGUIinstance.draft_modified)
+
+        #packing the textbox widgets into the left frame
+        self.name_box.pack(padx=10)
+        self.date_box.pack(padx=10)
+        self.book_box.pack(padx=10)
+        self.event_box.pack(padx=10)
+        self.verse_box.pack(padx=10)
+        self.time_box.pack(padx=10)
+        self.action_box.pack(padx=10)
+        
+#--------------BOTTOM FRAME---------------
+        #create and pack the cancel button
+        self.cancel_button = Tk.Button(self.bottom_frame, text='Cancel', command=self.parentGUIinstance.cancel_action, width=17, height=1, font=self.label_size)
+        self.cancel_button.grid(row=0, column=1, padx=50)
+
+        #create and pack the submit button
+        self.submit_button = Tk.Button(self.bottom_frame, text='Submit', command=self.parentGUIinstance.submit_pressed, width=17, height=1, font=self.label_size)
+        self.submit_button.grid(row=0, column=0, padx=50)
+
+    def textboxes(self) -> list[Tk.Text]:
+        """
+        Get the textboxes in the column order of the database
+        """
+        return [self.name_box, self.date_box, self.book_box, self.event_box, self.verse_box, self.time_box, self.action_box]
+
+class StatsGUI:
+    def __init__(self, parentGUIinstance: GUI) -> None:
+        """
+        GUI for the Stats tab, the numbers come from the ReadingSummary table
+        """
+        self.parentGUIinstance: GUI = parentGUIinstance
+        self.frame = ttk.Frame(self.parentGUIinstance.statsTab)
+        self.frame.pack(fill=Tk.BOTH, expand=True, padx=5, pady=5)
+        self.frame.columnconfigure(0, weight=1)
+        self.frame.columnconfigure(1, weight=1)
+
+        self.people_table = self.create_table(0, 0, "Minutes per person", ("Name", "Minutes", "Entries", "Streak", "Longest"))
+        self.books_table = self.create_table(0, 1, "Minutes per book", ("Book", "Minutes", "Entries"))
+        self.daily_table = self.create_table(2, 0, "Last 30 days", ("Date", "Minutes", "Entries"))
+        self.weekly_table = self.create_table(2, 1, "Last 12 weeks", ("Week", "Minutes", "Entries"))
+
+        # ChangeLog change_id when the tables were last filled, -1 means never
+        self.shown_changes: int = -1
+
+    def create_table(self, row: int, column: int, title: str, headings: tuple[str, ...]) -> ttk.Treeview:
+        """
+        Create a titled table in the grid of the Stats tab
+        """
+        label = ttk.Label(self.frame, text=title, font=font.Font(size=13))
+        label.grid(row=row, column=column, sticky="w", padx=5)
+        table = ttk.Treeview(self.frame, columns=headings, show="headings", height=7)
+        for heading in headings:
+            table.heading(heading, text=heading)
+            table.column(heading, width=80 if heading != headings[0] else 130, anchor=Tk.W if heading == headings[0] else Tk.E)
+        table.grid(row=row + 1, column=column, sticky="nsew", padx=5, pady=(0, 10))
+        return table
+
+    def fill_table(self, table: ttk.Treeview, rows: list[tuple]) -> None:
+        """
+        Replace the rows of a table
+        """
+        table.delete(*table.get_children())
+        for row in rows:
+            table.insert("", Tk.END, values=row)
+
+    def refresh(self) -> None:
+        """
+        Fill the tables again if anything was written since they were last filled
+        """
+        self.parentGUIinstance.run_in_background("Loading statistics", self.load_stats, self.shown_changes, on_done=self.show_stats)
+
+    @staticmethod
+    def load_stats(database: DatabaseConnection, shown_changes: int) -> dict | None:
+        """
+        Runs on the database worker, gets every statistic or None if nothing changed since 'shown_changes'
+        """
+        change_id = database.last_change_id()
+        if change_id == shown_changes:
+            return None
+        streaks = database.reading_streaks()
+        return {
+            "changes": change_id,
+            "people": [(name, minutes, entries, *streaks.get(name, (0, 0))) for name, minutes, entries in database.minutes_per_person()],
+            "books": database.minutes_per_book(),
+            "daily": database.daily_totals(30),
+            "weekly": database.weekly_totals(12),
+        }
+
+    def show_stats(self, stats: dict | None) -> None:
+        """
+        Fill the tables with statistics from load_stats
+        """
+        if stats is None:
+            return
+        self.shown_changes = stats["changes"]
+        self.fill_table(self.people_table, stats["people"])
+        self.fill_table(self.books_table, stats["books"])
+        self.fill_table(self.daily_table, stats["daily"])
+        self.fill_table(self.weekly_table, stats["weekly"])
+
+class DebugPanel:
+    # milliseconds between updates while the panel is open
+    REFRESH_MS: int = 1000
+
+    def __init__(self, parentGUIinstance: GUI) -> None:
+        """
+        Window with the profiler's timings and counters, opened from Debug > Profiler
+        """
+        self.parentGUIinstance: GUI = parentGUIinstance
+        self.profiler: "Profiler" = parentGUIinstance.profiler
+        self.window = Tk.Toplevel(parentGUIinstance.window)
+        self.window.title("Profiler")
+        self.window.geometry("900x500")
+
+        headings = ("Category", "Name", "Calls", "Total ms", "Mean ms", "Max ms")
+        self.timings_table = ttk.Treeview(self.window, columns=headings, show="headings")
+        for heading in headings:
+            self.timings_table.heading(heading, text=heading)
+            self.timings_table.column(heading, width=380 if heading == "Name" else 80, anchor=Tk.W if heading in ("Category", "Name") else Tk.E)
+        self.timings_table.pack(fill=Tk.BOTH, expand=True, padx=5, pady=5)
+
+        self.counters_label = ttk.Label(self.window, justify=Tk.LEFT)
+        self.counters_label.pack(fill=Tk.X, padx=5)
+        # filled in from the worker thread, which owns the connection and its cache
+        self.cache_line: str = ""
+
+        self.button_frame = ttk.Frame(self.window)
+        self.button_frame.pack(fill=Tk.X, padx=5, pady=5)
+        ttk.Button(self.button_frame, text="Refresh", command=self.refresh).pack(side=Tk.LEFT)
+        ttk.Button(self.button_frame, text="Clear", command=self.clear_pressed).pack(side=Tk.LEFT, padx=5)
+        ttk.Button(self.button_frame, text="Export trace...", command=self.export_pressed).pack(side=Tk.LEFT)
+
+        self.update_loop()
+
+    def count_widgets(self, widget: Tk.Misc) -> int:
+        return 1 + sum(self.count_widgets(child) for child in widget.winfo_children())
+
+    def update_loop(self) -> None:
+        """
+        Refresh every REFRESH_MS until the panel is closed
+        """
+        if self.window.winfo_exists():
+            self.refresh()
+            self.window.after(self.REFRESH_MS, self.update_loop)
+
+    def refresh(self) -> None:
+        """
+        Show the current timings, counters and event loop lag
+        """
+        self.timings_table.delete(*self.timings_table.get_children())
+        for category, name, calls, total, mean, longest in self.profiler.summary():
+            self.timings_table.insert("", Tk.END, values=(category, name, f"{calls:,}", f"{total:,.1f}", f"{mean:.3f}", f"{longest:.2f}"))
+
+        with self.profiler.lock:
+            counters = sorted(self.profiler.counters.items())
+        # statements are in the timings table's terms already, only show the other counters here
+        lines = [f"{name}: {value:,}" for name, value in counters if not name.startswith("sql: ")]
+        lines.append(f"SQL statements run: {sum(value for name, value in counters if name.startswith('sql: ')):,}")
+        lines.append(f"Widgets alive: {self.count_widgets(self.parentGUIinstance.window):,}")
+        lags = sorted(self.parentGUIinstance.loop_lags)
+        if lags:
+            lines.append(f"Event loop lag: median {1000 * lags[len(lags) // 2]:.1f} ms, "
+                f"99th percentile {1000 * lags[min(len(lags) - 1, len(lags) * 99 // 100)]:.1f} ms, max {1000 * lags[-1]:.1f} ms")
+        if self.cache_line:
+            lines.append(self.cache_line)
+        self.counters_label.config(text="\n".join(lines))
+        self.parentGUIinstance.run_in_background(None, self.cache_stats, on_done=self.show_cache_stats)
+
+    @staticmethod
+    def cache_stats(database: DatabaseConnection) -> dict | None:
+        """
+        Runs on the database worker, a RemoteDatabase has no cache of its own
+        """
+        cache = getattr(database, "entry_cache", None)
+        return cache.stats() if cache else None
+
+    def show_cache_stats(self, stats: dict | None) -> None:
+        if stats:
+            self.cache_line = (f"Entry cache: {stats['entries']:,} of {stats['size']:,} entries, "
+                f"{stats['hits']:,} hits, {stats['misses']:,} misses ({100 * stats['hit_rate']:.0f}% hits)")
+
+    def clear_pressed(self, *args) -> None:
+        self.profiler.clear()
+        self.parentGUIinstance.loop_lags.clear()
+        self.refresh()
+
+    def export_pressed(self, *args) -> None:
+        """
+        Save the recorded events as a trace file for chrome://tracing or ui.perfetto.dev
+        """
+        path = filedialog.asksaveasfilename(parent=self.window, title="Export trace", defaultextension=".json", filetypes=[("Trace", "*.json")])
+        if path:
+            events = self.profiler.export_trace(path)
+            messagebox.showinfo("Export trace", f"Wrote {events:,} events to {path}", parent=self.window)
+
+class GUI:
+    # milliseconds between checks for finished database calls
+    POLL_MS: int = 15
+    # milliseconds between event loop latency samples while profiling
+    LAG_SAMPLE_MS: int = 100
+    # the Update tab's draft is saved at most this often while typing
+    DRAFT_SAVE_MS: int = 1000
+    # edits that can be undone, older ones are forgotten
+    MAX_UNDO: int = 1000
+    # (entry id, texts) of empty textboxes
+    EMPTY_DRAFT: tuple[int, tuple[str, ...]] = (-1, ("",) * 7)
+
+    def __init__(self, profile: ConnectionProfile = PRODUCTION_PROFILE, server_url: str | None = None, profiler: "Profiler | None" = None, renderer: str = "widgets",
+            token: str | None = None):
+        """
+        Main window and GUI, 'server_url' uses a journal shared by 'faithwalk serve' instead of the profile's file,
+        'token' is the one the server was started with.
+        Passing a Profiler times the database and the GUI and adds a Debug menu to look at the timings.
+        'renderer' is "widgets" for View tab rows made of textboxes and buttons, or "canvas" for rows drawn on one canvas.
+        """
+        if renderer not in ("widgets", "canvas"):
+            raise Exception(f"GUI error: unknown renderer {renderer}")
+        self.renderer: str = renderer
+        self.profiler: "Profiler | None" = profiler
+        # settings like the View tab's sort are saved per journal
+        self.journal: str = server_url or os.path.abspath(profile.path)
+        # the database connection lives on a background thread, calls to it go through run_in_background
+        if server_url:
+            from faithwalk.client import RemoteDatabase
+            open_database = lambda profile: RemoteDatabase(server_url, token=token)
+        else:
+            open_database = DatabaseConnection
+        if profiler:
+            # only imported when profiling, so a normal start doesn't load it
+            from faithwalk.profiling import instrument_database
+            # the connection has to be instrumented on the worker thread that owns it
+            open_database = lambda profile, open_database=open_database: instrument_database(open_database(profile), profiler)
+        self.database_worker = DatabaseWorker(profile, open_database)
+        # calls that haven't finished yet: (future, on_done, message, on_error)
+        self.pending_calls: list[tuple[Future, Callable[[Any], None] | None, str | None, Callable[[BaseException], None] | None]] = []
+        
+        #generate_filler_entries(self.database)
+        # create the main window
+        self.window = Tk.Tk()
+        self.window.title("Faith Walk")
+        self.window.config(bg='#1e2124')
+        self.window.geometry('900x500')
+        self.window.resizable(False, False)
+
+        #menu bar for importing and exporting entries
+        self.menu_bar = Tk.Menu(self.window)
+        self.file_menu = Tk.Menu(self.menu_bar, tearoff=0)
+        self.file_menu.add_command(label="Import...", command=self.import_pressed)
+        self.file_menu.add_command(label="Export...", command=self.export_pressed)
+        self.file_menu.add_separator()
+        self.file_menu.add_command(label="Quit", command=self.on_closing)
+        self.menu_bar.add_cascade(label="File", menu=self.file_menu)
+        self.edit_menu = Tk.Menu(self.menu_bar, tearoff=0)
+        self.edit_menu.add_command(label="Undo", accelerator="Ctrl+Z", command=self.undo_pressed, state=Tk.DISABLED)
+        self.edit_menu.add_command(label="Redo", accelerator="Ctrl+Y", command=self.redo_pressed, state=Tk.DISABLED)
+        self.menu_bar.add_cascade(label="Edit", menu=self.edit_menu)
+        self.window.bind_all("<Control-z>", self.undo_pressed)
+        self.window.bind_all("<Control-y>", self.redo_pressed)
+        if profiler:
+            self.debug_menu = Tk.Menu(self.menu_bar, tearoff=0)
+            self.debug_menu.add_command(label="Profiler...", command=lambda: DebugPanel(self))
+            self.menu_bar.add_cascade(label="Debug", menu=self.debug_menu)
+        self.window.config(menu=self.menu_bar)
+
+        #status bar with a progress indicator while the database worker is busy
+        self.status_bar = ttk.Frame(self.window)
+        self.status_bar.pack(side=Tk.BOTTOM, fill=Tk.X)
+        self.status_label = ttk.Label(self.status_bar, text="")
+        self.status_label.pack(side=Tk.LEFT, padx=5)
+        self.progress_bar = ttk.Progressbar(self.status_bar, mode="indeterminate", length=150)
+        self.showing_progress: bool = False
+
+        #creating both Update and View tab
+        self.tabController = ttk.Notebook(self.window)
+        self.viewDatabaseTab = ttk.Frame(self.tabController)
+        self.changeDatabaseTab = ttk.Frame(self.tabController)
+        self.statsTab = ttk.Frame(self.tabController)
+        self.tabController.add(self.viewDatabaseTab, text ='View')
+        self.tabController.add(self.changeDatabaseTab, text ='Update')
+        self.tabController.add(self.statsTab, text ='Stats')
+        self.tabController.pack(expand=1, fill="both")
+        self.tabController.bind("<<NotebookTabChanged>>", self.on_tab_change)
+
+#------------------UPDATE Tab---------------------#
+
+        # the id of the entry that is being edited
+        # if it == -1, then there is no row being edited
+        self.row_being_edited: int = -1
+        # the entry being edited as it was loaded, what the edit journal records it changed from
+        self.entry_being_edited: Entry | None = None
+        # the draft and undo history of the Update tab are kept per person, so a shared journal keeps them apart
+        self.slot: str = draft_slot()
+        # whether a save of the draft is scheduled, and the (entry id, texts) saved last
+        self.draft_pending: bool = False
+        self.saved_draft: tuple[int, tuple[str, ...]] = self.EMPTY_DRAFT
+        # (before, after) of the edits that can be undone and redone, newest last
+        self.undo_stack: list[tuple[Entry | None, Entry | None]] = []
+        self.redo_stack: list[tuple[Entry | None, Entry | None]] = []
+
+        #create interface for the Update tab
+        self.change_tab = CreateEntryGUI(self)
+        
+        #detects when window is closed and calls 'on_closing' method
+        self.window.protocol("WM_DELETE_WINDOW", self.on_closing)
+
+#------------------VIEW Tab---------------------#
+        #keep the change log short, views that are further behind load everything again
+        self.run_in_background(None, "prune_change_log")
+        #bring back an entry that was being typed when the window closed or crashed, and the undo history
+        self.run_in_background(None, self.load_history, self.slot, on_done=self.history_loaded)
+        #view table
+        self.view_table = Table(self)
+
+#------------------STATS Tab---------------------#
+        #statistics are filled in when the tab is opened
+        self.stats_tab = StatsGUI(self)
+
+        if profiler:
+            # how late the samples run shows how long the event loop was blocked
+            self.loop_lags: collections.deque[float] = collections.deque(maxlen=600)
+            self.window.bind_all("<Destroy>", lambda event: profiler.count("widgets destroyed"))
+            self.next_lag_sample: float = time.perf_counter() + self.LAG_SAMPLE_MS / 1000
+            self.window.after(self.LAG_SAMPLE_MS, self.sample_event_loop)
+
+        #run mainloop
+        self.window.mainloop()
+
+    def on_closing(self) -> None:
+        """
+        Fires when 'X' button is clicked 
+        """
+        # save what is being typed now instead of waiting for the scheduled save
+        self.save_draft()
+        # waits for queued writes to finish before closing the connection
+        self.database_worker.stop()
+        self.window.destroy()
+
+    def save_setting(self, name: str, value: Any) -> None:
+        """
+        Remember a setting of this journal for the next time it is opened
+        """
+        settings = load_settings(self.journal)
+        settings[name] = value
+        try:
+            save_settings(self.journal, settings)
+        except OSError:
+            # not being able to remember a setting shouldn't get in the way of using the journal
+            pass
+
+    def sample_event_loop(self) -> None:
+        """
+        Record how late this sample ran, runs every LAG_SAMPLE_MS while profiling
+        """
+        now = time.perf_counter()
+        lag = max(0.0, now - self.next_lag_sample)
+        self.loop_lags.append(lag)
+        # only stalls are worth an event in the trace file
+        self.profiler.record("tk", "event loop lag", self.next_lag_sample, lag, keep_event=lag > 0.02)
+        self.next_lag_sample = now + self.LAG_SAMPLE_MS / 1000
+        self.window.after(self.LAG_SAMPLE_MS, self.sample_event_loop)
+
+    def import_pressed(self, *args) -> None:
+        """
+        Calls upon File > Import being chosen
+        """
+        path = filedialog.askopenfilename(title="Import entries", filetypes=[("CSV or JSON Lines", "*.csv *.jsonl"), ("All files", "*")])
+        if path:
+            self.run_in_background("Importing entries", import_entries, path, on_done=self.import_finished)
+
+    def import_finished(self, result: tuple[int, float]) -> None:
+        """
+        Show the imported entries and how fast the import was
+        """
+        rows, seconds = result
+        self.view_table.reset()
+        self.view_table.refresh()
+        messagebox.showinfo("Import", f"Imported {rows:,} entries in {seconds:.1f} seconds ({rows / max(seconds, 1e-9):,.0f} rows/sec)")
+
+    def export_pressed(self, *args) -> None:
+        """
+        Calls upon File > Export being chosen
+        """
+        path = filedialog.asksaveasfilename(title="Export entries", defaultextension=".csv", filetypes=[("CSV", "*.csv"), ("JSON Lines", "*.jsonl")])
+        if path:
+            self.run_in_background("Exporting entries", export_entries, path,
+                on_done=lambda result: messagebox.showinfo("Export", f"Exported {result[0]:,} entries to {path}")
+            )
+
+    def run_in_background(self, message: str | None, function: str | Callable[..., Any], *args, on_done: Callable[[Any], None] | None = None,
+            on_error: Callable[[BaseException], None] | None = None) -> Future:
+        """
+        Run a database call on the worker thread, 'on_done' is called with the result on the Tk thread.
+        If the call fails the error is shown, and 'on_error' is called with it on the Tk thread.
+        'message' is shown in the status bar while the call runs, None runs it without showing anything.
+        """
+        future = self.database_worker.submit(function, *args)
+        if self.profiler:
+            # from submitting to the result, including the time spent waiting behind other calls
+            name = function if isinstance(function, str) else function.__name__
+            start = time.perf_counter()
+            future.add_done_callback(lambda future: self.profiler.record("worker", name, start, time.perf_counter() - start))
+        if not self.pending_calls:
+            # start polling
+            self.window.after(self.POLL_MS, self.poll_database)
+        self.pending_calls.append((future, on_done, message, on_error))
+        self.show_status()
+        return future
+
+    def show_status(self) -> None:
+        """
+        Show the message of the oldest pending call in the status bar, with the progress indicator
+        """
+        messages = [message for future, on_done, message, on_error in self.pending_calls if message]
+        if messages:
+            self.status_label.config(text=messages[0] + "...")
+            if not self.showing_progress:
+                self.progress_bar.pack(side=Tk.RIGHT, padx=5, pady=2)
+                self.progress_bar.start(15)
+        else:
+            self.status_label.config(text="")
+            if self.showing_progress:
+                self.progress_bar.stop()
+                self.progress_bar.pack_forget()
+        self.showing_progress = bool(messages)
+
+    def poll_database(self) -> None:
+        """
+        Hand the results of finished database calls to their callbacks, runs every POLL_MS while calls are pending
+        """
+        still_pending = []
+        finished = []
+        for call in self.pending_calls:
+            (finished if call[0].done() else still_pending).append(call)
+        self.pending_calls = still_pending
+
+        for future, on_done, message, on_error in finished:
+            error = future.exception()
+            if error:
+                messagebox.showerror("Database error", f"{message or 'Database call'} failed: {error}")
+            # a failing callback mustn't stop the polling, the results of later calls would never be handled
+            try:
+                if error:
+                    if on_error:
+                        on_error(error)
+                elif on_done and self.profiler:
+                    with self.profiler.timed("tk", f"on_done: {message or getattr(on_done, '__name__', 'callback')}"):
+                        on_done(future.result())
+                elif on_done:
+                    on_done(future.result())
+            except Exception as error:
+                messagebox.showerror("Error", f"Showing the result of {message or 'a database call'} failed: {error}")
+
+        # callbacks may have queued more calls
+        if self.pending_calls:
+            self.window.after(self.POLL_MS, self.poll_database)
+        self.show_status()
+
+    def clear_textboxes(self):
+        """
+        Delete contents of textboxes, resets textbox widgets
+        """
+        # clear textboxes
+        self.change_tab.name_box.delete("1.0", Tk.END)
+        self.change_tab.date_box.delete("1.0", Tk.END)
+        self.change_tab.book_box.delete("1.0", Tk.END)
+        self.change_tab.event_box.delete("1.0", Tk.END)
+        self.change_tab.verse_box.delete("1.0", Tk.END)
+        self.change_tab.time_box.delete("1.0", Tk.END)
+        self.change_tab.action_box.delete("1.0", Tk.END)
+
+    def get_textboxes(self) -> Entry:
+        """
+        Change data from textbox widgets into string
+        """
+        # "end-1c" leaves out the newline that Tk.Text always keeps at the end, so searching by name or book matches
+        name_string: str = self.change_tab.name_box.get("1.0", "end-1c")
+        date_string: str = self.change_tab.date_box.get("1.0", "end-1c")
+        book_string: str = self.change_tab.book_box.get("1.0", "end-1c")
+        event_string: str = self.change_tab.event_box.get("1.0", "end-1c")
+        verse_string: str = self.change_tab.verse_box.get("1.0", "end-1c")
+        time_string: str = self.change_tab.time_box.get("1.0", "end-1c")
+        action_string: str = self.change_tab.action_box.get("1.0", "end-1c")
+
+        # new entries keep an id of -1 until they are added to the database
+        return Entry(name_string, date_string, book_string, event_string, verse_string, time_string, action_string, id = self.row_being_edited)
+
+    def edit_row(self, entry: Entry | None) -> None:
+        """
+        Edit a specific row in the view table
+        """
+        if entry is None:
+            # deleted by someone else since the table was shown
+            messagebox.showinfo("Edit", "This entry was deleted.")
+            self.cancel_action()
+            return
+        if entry.id != self.row_being_edited:
+            # editing was cancelled or moved to another entry while the entry was loading
+            return
+        # set textboxes to correct values, make cancel button visible and lock tab view on "Change Tab" until finished
+        self.entry_being_edited = entry
+        self.fill_textboxes(entry)
+
+    def fill_textboxes(self, entry: Entry) -> None:
+        """
+        Put the values of an entry in the textboxes, the draft only gets saved once they are changed
+        """
+        self.clear_textboxes()
+        # set change tab textboxes to be correct
+        texts = entry.texts()
+        self.saved_draft = (entry.id, tuple(texts))
+        self.change_tab.name_box.insert(Tk.END, texts[DataType.NAME.value])
+        self.change_tab.date_box.insert(Tk.END, texts[DataType.DATE.value])
+        self.change_tab.book_box.insert(Tk.END, texts[DataType.BOOK.value])
+        self.change_tab.event_box.insert(Tk.END, texts[DataType.EVENT.value])
+        self.change_tab.verse_box.insert(Tk.END, texts[DataType.VERSE.value])
+        self.change_tab.time_box.insert(Tk.END, texts[DataType.TIME.value])
+        self.change_tab.action_box.insert(Tk.END, texts[DataType.ACTION.value])
+
+    def on_tab_change(self, *args):
+        """
+        Calls when the user changes tabs 
+        """
+        # if a row is being edited, it will automatically switch back to the Update tab
+        if self.row_being_edited != -1:
+            self.tabController.select(self.changeDatabaseTab)
+        elif self.tabController.select() == str(self.statsTab):
+            self.stats_tab.refresh()
+ 
+    def submit_pressed(self, *args):
+        """
+        Create submit button that
+        """
+        if self.row_being_edited == -1:
+            self.save_to_database()
+        elif self.entry_being_edited is None:
+            # the entry is still loading
+            return
+        else:
+            editing_entry: Entry = self.get_textboxes()
+            # edit in the database, the view table picks up the change with its next sync
+            row_being_edited = self.row_being_edited
+            self.record_edit("Saving entry", self.entry_being_edited, editing_entry, clear_draft=True,
+                on_done=lambda: self.submit_finished(row_being_edited),
+                on_error=self.submit_failed
+            )
+        # the textboxes stay until the entry is saved, so it can't be submitted twice meanwhile
+        self.change_tab.submit_button.config(state=Tk.DISABLED)
+
+    def submit_finished(self, row_being_edited: int) -> None:
+        """
+        Calls once a submitted entry is saved, empties the Update tab and goes back to the view tab
+        """
+        self.change_tab.submit_button.config(state=Tk.NORMAL)
+        if self.row_being_edited != row_being_edited:
+            # cancelled and something else opened meanwhile
+            return
+        self.row_being_edited = -1
+        self.entry_being_edited = None
+        # the draft is deleted along with the edit
+        self.saved_draft = self.EMPTY_DRAFT
+        # focus on the view data tab
+        self.tabController.select(self.viewDatabaseTab)
+
+        #hide cancel button
+        self.clear_textboxes()
+
+    def submit_failed(self, error: BaseException) -> None:
+        """
+        Calls when a submitted entry couldn't be saved, the typed text is still in the Update tab to submit again or cancel
+        """
+        self.change_tab.submit_button.config(state=Tk.NORMAL)
+    
+    def cancel_action(self, *args):
+        """
+        Method to switch to view tab when cancel is clicked
+        """
+        self.row_being_edited = -1
+        self.entry_being_edited = None
+        # nothing is being typed any more
+        self.saved_draft = self.EMPTY_DRAFT
+        self.run_in_background(None, "delete_draft", self.slot)
+        # hide cancel button
+        self.clear_textboxes()
+        self.tabController.select(self.viewDatabaseTab)
+
+    def save_to_database(self) -> None:
+        """
+        Method to save entry to database row
+        """
+        #use the text from the textbox to create an entry for the database
+        database_Entry: Entry = self.get_textboxes()
+
+        #add the entry to the database, then sync the view table so the new row shows up
+        self.record_edit("Adding entry", None, database_Entry, clear_draft=True,
+            on_done=lambda: self.submit_finished(-1),
+            on_error=self.submit_failed
+        )
+
+    def draft_modified(self, event: Tk.Event) -> None:
+        """
+        Calls when the text of a textbox in the Update tab changes, schedules saving the draft
+        """
+        # resetting the flag fires <<Modified>> again
+        if not event.widget.edit_modified():
+            return
+        event.widget.edit_modified(False)
+        # one save per DRAFT_SAVE_MS covers all the keystrokes in between
+        if not self.draft_pending:
+            self.draft_pending = True
+            self.window.after(self.DRAFT_SAVE_MS, self.save_draft)
+
+    def save_draft(self) -> None:
+        """
+        Save what is typed in the Update tab, so it is still there after a crash
+        """
+        self.draft_pending = False
+        draft = self.get_textboxes()
+        state = (draft.id, draft.values())
+        if state == self.saved_draft:
+            return
+        self.saved_draft = state
+        if state == self.EMPTY_DRAFT:
+            self.run_in_background(None, "delete_draft", self.slot)
+        else:
+            self.run_in_background(None, "save_draft", self.slot, draft)
+
+    @staticmethod
+    def load_history(database: DatabaseConnection, slot: str) -> tuple[Entry | None, Entry | None, list]:
+        """
+        Runs on the database worker, gets the saved draft, the entry it edits and the edit journal
+        """
+        draft = database.get_draft(slot)
+        original = database.get_entry(draft.id) if draft and draft.id != -1 else None
+        return draft, original, database.get_edit_journal(slot, GUI.MAX_UNDO)
+
+    def history_loaded(self, history: tuple[Entry | None, Entry | None, list]) -> None:
+        """
+        Rebuild the undo and redo stacks from the edit journal and put the saved draft back in the Update tab
+        """
+        draft, original, journal = history
+        undo_stack: list[tuple[Entry | None, Entry | None]] = []
+        redo_stack: list[tuple[Entry | None, Entry | None]] = []
+        for journal_id, kind, before, after in journal:
+            if kind == "edit":
+                undo_stack.append((before, after))
+                redo_stack.clear()
+            elif kind == "undo" and undo_stack:
+                redo_stack.append(undo_stack.pop())
+            elif kind == "redo" and redo_stack:
+                undo_stack.append(redo_stack.pop())
+        self.undo_stack, self.redo_stack = undo_stack, redo_stack
+        self.show_undo_state()
+
+        # don't overwrite anything typed or opened for editing since the window opened
+        if draft is None or self.row_being_edited != -1 or self.get_textboxes().values() != self.EMPTY_DRAFT[1]:
+            return
+        if draft.id != -1 and original is None:
+            # the entry was deleted since, the draft is added as a new entry instead
+            draft.id = -1
+        self.row_being_edited = draft.id
+        self.entry_being_edited = original
+        self.fill_textboxes(draft)
+        self.tabController.select(self.changeDatabaseTab)
+        messagebox.showinfo("Draft", "The entry you were typing when Faith Walk closed has been restored.")
+
+    def record_edit(self, message: str, before: Entry | None, after: Entry | None, clear_draft: bool = False,
+            on_done: Callable[[], None] | None = None, on_error: Callable[[BaseException], None] | None = None) -> None:
+        """
+        Add, edit or delete an entry through the edit journal, see DatabaseConnection.apply_edit.
+        'before' is the entry as it was shown, so the journal doesn't have to look it up.
+        """
+        def recorded(journal_id: int) -> None:
+            self.edits_recorded([(before, after)])
+            if on_done is not None:
+                on_done()
+
+        self.run_in_background(message, "apply_edit", self.slot, before, after, "edit", clear_draft, on_done=recorded, on_error=on_error)
+
+    def edits_recorded(self, edits: list[tuple[Entry | None, Entry | None]]) -> None:
+        """
+        Make finished edits the next ones to undo, newest last, and show them in the view table
+        """
+        self.undo_stack.extend(edits)
+        del self.undo_stack[:-self.MAX_UNDO]
+        self.redo_stack.clear()
+        self.show_undo_state()
+        self.view_table.sync()
+
+    def undo_pressed(self, *args) -> None:
+        """
+        Calls upon Edit > Undo, puts back the entry as it was before the last edit
+        """
+        self.walk_history(self.undo_stack, self.redo_stack, "undo", *args)
+
+    def redo_pressed(self, *args) -> None:
+        """
+        Calls upon Edit > Redo, makes the last undone edit again
+        """
+        self.walk_history(self.redo_stack, self.undo_stack, "redo", *args)
+
+    def walk_history(self, from_stack: list, to_stack: list, kind: str, *args) -> None:
+        """
+        Undo or redo the newest edit of 'from_stack' and move it to 'to_stack'
+        """
+        # in a textbox or the search box the keys are for its text, not the journal
+        if args and isinstance(self.window.focus_get(), (Tk.Text, Tk.Entry)):
+            return
+        if not from_stack:
+            return
+        edit = from_stack.pop()
+        self.show_undo_state()
+        before, after = edit
+        # an undo changes the entry from 'after' back to 'before'
+        change = (after, before) if kind == "undo" else (before, after)
+        # the edit only moves to 'to_stack' once it is made, if it fails it can be tried again
+        self.run_in_background(kind.capitalize() + "ing edit", "apply_edit", self.slot, *change, kind,
+            on_done=lambda journal_id: self.history_walked(to_stack, edit),
+            on_error=lambda error: self.history_walked(from_stack, edit)
+        )
+
+    def history_walked(self, stack: list, edit: tuple[Entry | None, Entry | None]) -> None:
+        """
+        Put an undone, redone or failed edit on 'stack' and show the journal's entries as they are now
+        """
+        stack.append(edit)
+        self.show_undo_state()
+        self.view_table.sync()
+
+    def show_undo_state(self) -> None:
+        """
+        Enable Undo and Redo in the Edit menu when there is something to undo or redo
+        """
+        self.edit_menu.entryconfig(0, state=Tk.NORMAL if self.undo_stack else Tk.DISABLED)
+        self.edit_menu.entryconfig(1, state=Tk.NORMAL if self.redo_stack else Tk.DISABLED)
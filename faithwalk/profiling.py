@@ -0,0 +1,182 @@
+"""
+Opt-in timing of the database, the SQL it runs and the GUI, exportable as a Chrome/Perfetto trace file.
+Nothing here runs unless a Profiler is passed in, so the normal paths pay nothing for it.
+"""
+import collections
+import functools
+import inspect
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from faithwalk.database import DatabaseConnection
+from faithwalk.entry import Entry
+
+class Profiler:
+    # timed events kept for the trace file, the oldest are dropped first
+    MAX_EVENTS: int = 200000
+
+    def __init__(self) -> None:
+        """
+        Collects timings and counters from every thread
+        """
+        self.lock = threading.Lock()
+        self.start: float = time.perf_counter()
+        # (category, name, start, seconds, thread id) in the order they finished
+        self.events: collections.deque = collections.deque(maxlen=self.MAX_EVENTS)
+        # (category, name) -> [calls, total seconds, longest seconds]
+        self.timings: dict[tuple[str, str], list] = {}
+        self.counters: collections.Counter = collections.Counter()
+        self.thread_names: dict[int, str] = {}
+
+    def record(self, category: str, name: str, start: float, seconds: float, keep_event: bool = True) -> None:
+        """
+        Add a timing, 'keep_event' False only adds it to the totals, for things that happen per row
+        """
+        thread = threading.get_ident()
+        with self.lock:
+            timing = self.timings.get((category, name))
+            if timing is None:
+                self.timings[(category, name)] = [1, seconds, seconds]
+            else:
+                timing[0] += 1
+                timing[1] += seconds
+                if seconds > timing[2]:
+                    timing[2] = seconds
+            if keep_event:
+                self.events.append((category, name, start, seconds, thread))
+                if thread not in self.thread_names:
+                    self.thread_names[thread] = threading.current_thread().name
+
+    def count(self, name: str, amount: int = 1) -> None:
+        with self.lock:
+            self.counters[name] += amount
+
+    @contextmanager
+    def timed(self, category: str, name: str) -> Iterator[None]:
+        """
+        Time the code inside the block
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(category, name, start, time.perf_counter() - start)
+
+    def clear(self) -> None:
+        with self.lock:
+            self.start = time.perf_counter()
+            self.events.clear()
+            self.timings.clear()
+            self.counters.clear()
+
+    def summary(self) -> list[tuple[str, str, int, float, float, float]]:
+        """
+        Get (category, name, calls, total ms, mean ms, longest ms) for everything timed, most total time first
+        """
+        with self.lock:
+            rows = [(category, name, calls, 1000 * total, 1000 * total / calls, 1000 * longest)
+                for (category, name), (calls, total, longest) in self.timings.items()]
+        return sorted(rows, key=lambda row: row[3], reverse=True)
+
+    def format_summary(self) -> str:
+        """
+        Get the summary and the counters as a text table
+        """
+        lines = [f"{'category':<10}{'name':<48}{'calls':>9}{'total ms':>12}{'mean ms':>10}{'max ms':>10}"]
+        for category, name, calls, total, mean, longest in self.summary():
+            lines.append(f"{category:<10}{name[:47]:<48}{calls:>9,}{total:>12,.1f}{mean:>10.3f}{longest:>10.2f}")
+        with self.lock:
+            lines.extend(f"{name}: {value:,}" for name, value in sorted(self.counters.items()))
+        return "\n".join(lines)
+
+    def export_trace(self, path: str) -> int:
+        """
+        Write the events as a Chrome trace file, open it in chrome://tracing or ui.perfetto.dev.
+        Returns the number of events written.
+        """
+        with self.lock:
+            events = list(self.events)
+            thread_names = dict(self.thread_names)
+            # statement counts would each be a track of their own, they are in format_summary instead
+            counters = {name: value for name, value in self.counters.items() if not name.startswith("sql: ")}
+            start = self.start
+        trace = [{"name": "thread_name", "ph": "M", "pid": 1, "tid": thread, "args": {"name": name}} for thread, name in thread_names.items()]
+        trace.extend({"name": name, "cat": category, "ph": "X", "pid": 1, "tid": thread,
+            "ts": round(1e6 * (event_start - start), 1), "dur": round(1e6 * seconds, 1)}
+            for category, name, event_start, seconds, thread in events)
+        if counters:
+            trace.append({"name": "counters", "ph": "C", "pid": 1, "tid": 0, "ts": round(1e6 * (time.perf_counter() - start), 1), "args": counters})
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, file)
+        return len(trace)
+
+def statement_name(statement: str) -> str:
+    """
+    Shorten an SQL statement to a name for the summary. sqlite3 traces statements with their
+    parameters filled in, so numbers and strings are turned back into ? to count them together.
+    """
+    statement = re.sub(r"'(?:[^']|'')*'|(?<![\w.])-?\d+(?:\.\d+)?\b", "?", statement)
+    return re.sub(r"\s+", " ", statement).strip()[:120]
+
+def instrument_database(database: DatabaseConnection, profiler: Profiler) -> DatabaseConnection:
+    """
+    Time every public method of a connection, trace the SQL it runs and time building Entries from rows.
+    Has to be called on the thread that uses the connection. A RemoteDatabase only gets its methods timed.
+    """
+    for name, method in inspect.getmembers(database, inspect.ismethod):
+        if not name.startswith("_"):
+            setattr(database, name, timed_method(profiler, name, method))
+
+    if not isinstance(database.connection, sqlite3.Connection):
+        # a RemoteDatabase, its SQL runs on the server
+        return database
+
+    # the trace callback only says when a statement starts, the method timings say how long they took
+    database.connection.set_trace_callback(lambda statement: profiler.count("sql: " + statement_name(statement)))
+
+    def timed_row_factory(cursor, row: tuple) -> Entry:
+        start = time.perf_counter()
+        entry = Entry.row_factory(cursor, row)
+        profiler.record("entry", "Entry.row_factory", start, time.perf_counter() - start, keep_event=False)
+        return entry
+    database.entry_cursor.row_factory = timed_row_factory
+    return database
+
+def timed_method(profiler: Profiler, name: str, method: Callable[..., Any]) -> Callable[..., Any]:
+    """
+    Wrap a DatabaseConnection method so its calls are timed
+    """
+    if inspect.isgeneratorfunction(method):
+        # time the whole iteration, not just creating the generator
+        @functools.wraps(method)
+        def timed_generator(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                yield from method(*args, **kwargs)
+            finally:
+                profiler.record("database", name, start, time.perf_counter() - start)
+        return timed_generator
+    if hasattr(method, "__wrapped__") and inspect.isgeneratorfunction(method.__wrapped__):
+        # a @contextmanager, time the block it wraps
+        @functools.wraps(method)
+        @contextmanager
+        def timed_block(*args, **kwargs):
+            with profiler.timed("database", name):
+                with method(*args, **kwargs) as value:
+                    yield value
+        return timed_block
+
+    @functools.wraps(method)
+    def timed_call(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            profiler.record("database", name, start, time.perf_counter() - start)
+    return timed_call
@@ -0,0 +1,222 @@
+"""
+Schema of the journal database, applied as numbered migrations
+"""
+import sqlite3
+from collections.abc import Callable
+
+from faithwalk.entry import Entry
+
+def create_table(cursor: sqlite3.Cursor) -> None:
+    """
+    Version 1: the original table, everything stored as TEXT
+    """
+    cursor.execute("""CREATE table if not exists DailyBibleReading (
+        id INTEGER primary key autoincrement, 
+        name_row TEXT, 
+        date_row TEXT, 
+        book_row TEXT,
+        event_row TEXT,
+        verse_row TEXT,
+        time_row TEXT,
+        action_row TEXT
+    )""")
+
+def create_search_index(cursor: sqlite3.Cursor) -> None:
+    """
+    Version 2: indexes for filtering by name, date and book,
+    and a full text search table over the event, verse and action text, kept in sync by triggers
+    """
+    create_indexes(cursor)
+    # the search table only stores the index, the text itself is read from DailyBibleReading
+    cursor.execute("""CREATE VIRTUAL TABLE if not exists DailyBibleReading_fts USING fts5 (
+        event_row, verse_row, action_row, content='DailyBibleReading', content_rowid='id'
+    )""")
+    create_search_triggers(cursor)
+    # index the entries that were added before the search table existed
+    cursor.execute("INSERT INTO DailyBibleReading_fts (DailyBibleReading_fts) VALUES ('rebuild')")
+
+def create_indexes(cursor: sqlite3.Cursor) -> None:
+    """
+    Create the indexes on DailyBibleReading
+    """
+    cursor.execute("CREATE INDEX if not exists DailyBibleReading_name ON DailyBibleReading (name_row COLLATE NOCASE)")
+    cursor.execute("CREATE INDEX if not exists DailyBibleReading_date ON DailyBibleReading (date_row)")
+    cursor.execute("CREATE INDEX if not exists DailyBibleReading_book ON DailyBibleReading (book_row COLLATE NOCASE)")
+
+def create_search_triggers(cursor: sqlite3.Cursor) -> None:
+    """
+    Create the triggers that keep DailyBibleReading_fts in sync with DailyBibleReading
+    """
+    cursor.execute("""CREATE TRIGGER if not exists DailyBibleReading_fts_insert AFTER INSERT ON DailyBibleReading BEGIN
+        INSERT INTO DailyBibleReading_fts (rowid, event_row, verse_row, action_row) VALUES (new.id, new.event_row, new.verse_row, new.action_row);
+    END""")
+    cursor.execute("""CREATE TRIGGER if not exists DailyBibleReading_fts_delete AFTER DELETE ON DailyBibleReading BEGIN
+        INSERT INTO DailyBibleReading_fts (DailyBibleReading_fts, rowid, event_row, verse_row, action_row) VALUES ('delete', old.id, old.event_row, old.verse_row, old.action_row);
+    END""")
+    cursor.execute("""CREATE TRIGGER if not exists DailyBibleReading_fts_update AFTER UPDATE ON DailyBibleReading BEGIN
+        INSERT INTO DailyBibleReading_fts (DailyBibleReading_fts, rowid, event_row, verse_row, action_row) VALUES ('delete', old.id, old.event_row, old.verse_row, old.action_row);
+        INSERT INTO DailyBibleReading_fts (rowid, event_row, verse_row, action_row) VALUES (new.id, new.event_row, new.verse_row, new.action_row);
+    END""")
+
+def convert_column_types(cursor: sqlite3.Cursor) -> None:
+    """
+    Version 3: ISO-8601 dates, INTEGER minutes and no whitespace around the text.
+    SQLite can't change the type of a column, so the table is copied into a new one.
+    """
+    cursor.execute("""CREATE table DailyBibleReading_typed (
+        id INTEGER primary key autoincrement, 
+        name_row TEXT, 
+        date_row TEXT, -- ISO-8601, YYYY-MM-DD
+        book_row TEXT,
+        event_row TEXT,
+        verse_row TEXT,
+        time_row INTEGER, -- minutes
+        action_row TEXT
+    )""")
+    # a separate cursor reads the old rows while 'cursor' writes the new ones
+    rows = cursor.connection.execute("SELECT * FROM DailyBibleReading ORDER BY id")
+    while True:
+        batch = rows.fetchmany(1000)
+        if not batch:
+            break
+        cursor.executemany("INSERT into DailyBibleReading_typed (id, name_row, date_row, book_row, event_row, verse_row, time_row, action_row) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [(row[0], *Entry.from_row(row).normalize().values()) for row in batch]
+        )
+    # carry over the AUTOINCREMENT counter, so the ids of deleted last entries aren't handed out again
+    cursor.execute("DELETE FROM sqlite_sequence WHERE name = 'DailyBibleReading_typed'")
+    cursor.execute("INSERT INTO sqlite_sequence (name, seq) SELECT 'DailyBibleReading_typed', seq FROM sqlite_sequence WHERE name = 'DailyBibleReading'")
+    # dropping the table also drops its indexes and triggers, they are created again below
+    cursor.execute("DROP TABLE DailyBibleReading")
+    cursor.execute("ALTER TABLE DailyBibleReading_typed RENAME TO DailyBibleReading")
+    create_indexes(cursor)
+    create_search_triggers(cursor)
+    cursor.execute("INSERT INTO DailyBibleReading_fts (DailyBibleReading_fts) VALUES ('rebuild')")
+
+def create_summary_table(cursor: sqlite3.Cursor) -> None:
+    """
+    Version 4: minutes and entry counts per name, date and book, kept up to date by triggers.
+    Statistics are grouped from this table, which has one row per person per day per book instead of one per entry.
+    """
+    # NULLs are stored as '' so they still collide in the primary key
+    cursor.execute("""CREATE table if not exists ReadingSummary (
+        name_row TEXT NOT NULL,
+        date_row TEXT NOT NULL,
+        book_row TEXT NOT NULL,
+        minutes INTEGER NOT NULL,
+        entries INTEGER NOT NULL,
+        PRIMARY KEY (name_row, date_row, book_row)
+    ) WITHOUT ROWID""")
+    cursor.execute("CREATE INDEX if not exists ReadingSummary_date ON ReadingSummary (date_row)")
+    create_summary_triggers(cursor)
+
+    # summarize the entries that already exist
+    cursor.execute("DELETE FROM ReadingSummary")
+    summarize_entries(cursor, -1)
+
+def create_summary_triggers(cursor: sqlite3.Cursor) -> None:
+    """
+    Create the triggers that keep ReadingSummary in sync with DailyBibleReading
+    """
+    # minutes that couldn't be parsed are stored as text and count as 0
+    add = """INSERT INTO ReadingSummary (name_row, date_row, book_row, minutes, entries)
+        VALUES (ifnull(new.name_row, ''), ifnull(new.date_row, ''), ifnull(new.book_row, ''), CASE WHEN typeof(new.time_row) = 'integer' THEN new.time_row ELSE 0 END, 1)
+        ON CONFLICT (name_row, date_row, book_row) DO UPDATE SET minutes = minutes + excluded.minutes, entries = entries + 1;"""
+    remove = """UPDATE ReadingSummary SET minutes = minutes - CASE WHEN typeof(old.time_row) = 'integer' THEN old.time_row ELSE 0 END, entries = entries - 1
+        WHERE name_row = ifnull(old.name_row, '') AND date_row = ifnull(old.date_row, '') AND book_row = ifnull(old.book_row, '');
+        DELETE FROM ReadingSummary WHERE entries <= 0 AND name_row = ifnull(old.name_row, '') AND date_row = ifnull(old.date_row, '') AND book_row = ifnull(old.book_row, '');"""
+    cursor.execute(f"CREATE TRIGGER if not exists ReadingSummary_insert AFTER INSERT ON DailyBibleReading BEGIN {add} END")
+    cursor.execute(f"CREATE TRIGGER if not exists ReadingSummary_delete AFTER DELETE ON DailyBibleReading BEGIN {remove} END")
+    cursor.execute(f"CREATE TRIGGER if not exists ReadingSummary_update AFTER UPDATE ON DailyBibleReading BEGIN {remove} {add} END")
+
+def summarize_entries(cursor: sqlite3.Cursor, after_id: int) -> None:
+    """
+    Add the entries with an id greater than 'after_id' to ReadingSummary in one grouped statement
+    """
+    # the WHERE clause is required for SQLite to read ON CONFLICT as an upsert after a SELECT
+    cursor.execute("""INSERT INTO ReadingSummary (name_row, date_row, book_row, minutes, entries)
+        SELECT ifnull(name_row, ''), ifnull(date_row, ''), ifnull(book_row, ''), SUM(CASE WHEN typeof(time_row) = 'integer' THEN time_row ELSE 0 END), COUNT(*)
+        FROM DailyBibleReading WHERE id > ? GROUP BY 1, 2, 3
+        ON CONFLICT (name_row, date_row, book_row) DO UPDATE SET minutes = minutes + excluded.minutes, entries = entries + excluded.entries""", (after_id,))
+
+def create_import_progress_table(cursor: sqlite3.Cursor) -> None:
+    """
+    Version 5: how many rows of each imported file are in the database, so a failed import can carry on where it stopped
+    """
+    cursor.execute("""CREATE table if not exists ImportProgress (
+        source TEXT primary key,
+        rows_done INTEGER NOT NULL
+    )""")
+
+def create_change_log(cursor: sqlite3.Cursor) -> None:
+    """
+    Version 6: the ids of changed entries in the order they changed, so views can catch up on changes made by any connection.
+    A NULL entry_id means too many entries changed at once to list, views load everything again.
+    """
+    cursor.execute("""CREATE table if not exists ChangeLog (
+        change_id INTEGER primary key autoincrement,
+        entry_id INTEGER
+    )""")
+    create_change_triggers(cursor)
+
+def create_change_triggers(cursor: sqlite3.Cursor) -> None:
+    """
+    Create the triggers that log changes of DailyBibleReading in ChangeLog
+    """
+    cursor.execute("""CREATE TRIGGER if not exists ChangeLog_insert AFTER INSERT ON DailyBibleReading BEGIN
+        INSERT INTO ChangeLog (entry_id) VALUES (new.id);
+    END""")
+    cursor.execute("""CREATE TRIGGER if not exists ChangeLog_delete AFTER DELETE ON DailyBibleReading BEGIN
+        INSERT INTO ChangeLog (entry_id) VALUES (old.id);
+    END""")
+    cursor.execute("""CREATE TRIGGER if not exists ChangeLog_update AFTER UPDATE ON DailyBibleReading BEGIN
+        INSERT INTO ChangeLog (entry_id) VALUES (new.id);
+    END""")
+
+def create_sort_indexes(cursor: sqlite3.Cursor) -> None:
+    """
+    Version 7: an index for sorting by minutes, the other sortable columns already have one.
+    Every index ends in the id, so paging a sorted view seeks straight to (value, id).
+    """
+    cursor.execute("CREATE INDEX if not exists DailyBibleReading_minutes ON DailyBibleReading (time_row)")
+
+def create_draft_tables(cursor: sqlite3.Cursor) -> None:
+    """
+    Version 8: entries being typed in the Update tab, saved as typed so they survive a crash,
+    and an append-only journal of the edits made there, which undo and redo walk through.
+    Both are kept per slot, so people sharing a journal don't get each other's drafts or history.
+    """
+    cursor.execute("""CREATE table if not exists Draft (
+        slot TEXT primary key,
+        entry_id INTEGER NOT NULL,
+        name_row TEXT,
+        date_row TEXT,
+        book_row TEXT,
+        event_row TEXT,
+        verse_row TEXT,
+        time_row TEXT,
+        action_row TEXT,
+        saved_at TEXT NOT NULL DEFAULT (datetime('now'))
+    )""")
+    # before_entry/after_entry are JSON [id, values...], NULL before an add and after a delete
+    cursor.execute("""CREATE table if not exists EditJournal (
+        journal_id INTEGER primary key autoincrement,
+        slot TEXT NOT NULL,
+        kind TEXT NOT NULL,
+        entry_id INTEGER NOT NULL,
+        before_entry TEXT,
+        after_entry TEXT,
+        made_at TEXT NOT NULL DEFAULT (datetime('now'))
+    )""")
+    cursor.execute("CREATE INDEX if not exists EditJournal_slot ON EditJournal (slot, journal_id)")
+
+# the schema version of a database is the number of migrations applied to it, stored in PRAGMA user_version
+MIGRATIONS: list[Callable[[sqlite3.Cursor], None]] = [
+    create_table,
+    create_search_index,
+    convert_column_types,
+    create_summary_table,
+    create_import_progress_table,
+    create_change_log,
+    create_sort_indexes,
+    create_draft_tables,
+]
@@ -0,0 +1,311 @@
+"""
+HTTP/JSON server that lets several people share one journal database, see faithwalk.client for the other end
+"""
+import hmac
+import ipaddress
+import json
+import re
+import sys
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Any
+from urllib.parse import parse_qs, urlsplit
+
+from faithwalk.database import PRODUCTION_PROFILE, ConnectionProfile, DatabaseConnection
+from faithwalk.entry import EntryFilter, EntrySort
+from faithwalk.transfer import entry_record, record_entry, record_to_entry
+from faithwalk.worker import DatabaseWorker
+
+if TYPE_CHECKING:
+    from faithwalk.profiling import Profiler
+
+class ConnectionPool:
+    def __init__(self, profile: ConnectionProfile = PRODUCTION_PROFILE, readers: int = 4, profiler: "Profiler | None" = None) -> None:
+        """
+        One writer and 'readers' reader connections, each owned by its own DatabaseWorker thread.
+        Writes run one at a time on the writer, reads go to the reader with the fewest queued calls.
+        With a WAL profile the readers never wait for the writer. A Profiler times every connection.
+        """
+        if readers < 1:
+            raise Exception("Pool error: at least one reader is needed")
+        open_database: Callable[[ConnectionProfile], Any] = DatabaseConnection
+        if profiler:
+            from faithwalk.profiling import instrument_database
+            open_database = lambda profile: instrument_database(DatabaseConnection(profile), profiler)
+        self.writer = DatabaseWorker(profile, open_database)
+        # let the writer create or migrate the schema before the readers open the file
+        self.writer.submit("schema_version").result()
+        self.readers = [DatabaseWorker(profile, open_database) for _ in range(readers)]
+
+    def read(self, function: str | Callable[..., Any], *args) -> Any:
+        """
+        Run a call that doesn't write on a reader and wait for its result
+        """
+        reader = min(self.readers, key=lambda worker: worker.requests.qsize())
+        return reader.submit(function, *args).result()
+
+    def write(self, function: str | Callable[..., Any], *args) -> Any:
+        """
+        Run a call that writes on the writer and wait for its result
+        """
+        return self.writer.submit(function, *args).result()
+
+    def close(self) -> None:
+        """
+        Finish the queued calls and close every connection
+        """
+        for worker in [self.writer, *self.readers]:
+            worker.stop()
+
+def add_entry(database: DatabaseConnection, record: dict) -> int:
+    entry = record_entry(record)
+    database.add_entry(entry)
+    return entry.id
+
+def edit_entry(database: DatabaseConnection, entry_id: int, record: dict) -> None:
+    entry = record_entry(record)
+    entry.id = entry_id
+    database.edit_entry(entry)
+
+def add_entries(database: DatabaseConnection, records: list[dict]) -> dict:
+    entries = [record_entry(record) for record in records]
+    database.add_entries(entries)
+    return {"ids": [entry.id for entry in entries], "rate": database.last_batch_rate}
+
+def edit_entries(database: DatabaseConnection, records: list[dict]) -> dict:
+    entries = []
+    for record in records:
+        entry = record_entry(record)
+        entry.id = int(record["id"])
+        entries.append(entry)
+    return {"count": database.edit_entries(entries), "rate": database.last_batch_rate}
+
+def delete_entries(database: DatabaseConnection, entry_ids: list[int]) -> dict:
+    return {"count": database.delete_entries([int(entry_id) for entry_id in entry_ids]), "rate": database.last_batch_rate}
+
+def bulk_add_entries(database: DatabaseConnection, bulk: dict) -> dict:
+    """
+    Add a chunk of an import and record the import progress in the same bulk_load
+    """
+    entries = [record_entry(record) for record in bulk["entries"]]
+    with database.bulk_load():
+        database.add_entries(entries)
+        if bulk.get("source"):
+            database.set_import_progress(bulk["source"], int(bulk["rows_done"]))
+    return {"count": len(entries), "rate": database.last_batch_rate}
+
+def get_changes(database: DatabaseConnection, change_id: int, entry_filter: EntryFilter) -> dict:
+    changes = database.changes_since(change_id, entry_filter)
+    return {
+        "change_id": changes.change_id,
+        "entries": [entry_record(entry) for entry in changes.entries],
+        "removed_ids": changes.removed_ids,
+        "reload": changes.reload,
+    }
+
+def get_entry(database: DatabaseConnection, entry_id: int) -> dict | None:
+    entry = database.get_entry(entry_id)
+    return None if entry is None else entry_record(entry)
+
+def get_entries_by_ids(database: DatabaseConnection, entry_ids: list[int]) -> list[dict]:
+    return [entry_record(entry) for entry in database.get_entries_by_ids([int(entry_id) for entry_id in entry_ids])]
+
+def get_entries_page(database: DatabaseConnection, after_id: int, limit: int, entry_filter: EntryFilter) -> list[dict]:
+    return [entry_record(entry) for entry in database.get_entries_page(after_id, limit, entry_filter)]
+
+def get_entries_sorted(database: DatabaseConnection, entry_sort: EntrySort, after: tuple | None, limit: int, entry_filter: EntryFilter) -> list[dict]:
+    return [entry_record(entry) for entry in database.get_entries_sorted(entry_sort, after, limit, entry_filter)]
+
+def apply_edit(database: DatabaseConnection, edit: dict) -> dict:
+    before = None if edit["before"] is None else record_to_entry(edit["before"])
+    after = None if edit["after"] is None else record_to_entry(edit["after"])
+    journal_id = database.apply_edit(edit["slot"], before, after, edit.get("kind", "edit"), bool(edit.get("clear_draft")))
+    # 'after' as it was stored, the client needs it to undo the edit later
+    return {"journal_id": journal_id, "after": None if after is None else entry_record(after)}
+
+def apply_deletes(database: DatabaseConnection, deletes: dict) -> dict:
+    journal_ids = database.apply_deletes(deletes["slot"], [record_to_entry(record) for record in deletes["entries"]])
+    return {"journal_ids": journal_ids, "rate": database.last_batch_rate}
+
+def get_edit_journal(database: DatabaseConnection, slot: str, limit: int) -> list[list]:
+    return [[journal_id, kind, None if before is None else entry_record(before), None if after is None else entry_record(after)]
+        for journal_id, kind, before, after in database.get_edit_journal(slot, limit)]
+
+def save_draft(database: DatabaseConnection, slot: str, record: dict) -> None:
+    database.save_draft(slot, record_to_entry(record))
+
+def get_draft(database: DatabaseConnection, slot: str) -> dict | None:
+    draft = database.get_draft(slot)
+    return None if draft is None else entry_record(draft)
+
+class JournalRequestHandler(BaseHTTPRequestHandler):
+    """
+    Answers the requests of one client connection, every response is JSON
+    """
+    # keep connections open between requests
+    protocol_version = "HTTP/1.1"
+    # headers and body are written separately, Nagle's algorithm would hold the body back for the client's delayed ACK
+    disable_nagle_algorithm = True
+    server: "JournalServer"
+
+    def do_GET(self) -> None:
+        self.handle_request("GET")
+
+    def do_POST(self) -> None:
+        self.handle_request("POST")
+
+    def do_PUT(self) -> None:
+        self.handle_request("PUT")
+
+    def do_DELETE(self) -> None:
+        self.handle_request("DELETE")
+
+    def handle_request(self, method: str) -> None:
+        parts = urlsplit(self.path)
+        query = {key: values[-1] for key, values in parse_qs(parts.query).items()}
+        length = int(self.headers.get("Content-Length") or 0)
+        data = self.rfile.read(length)
+        try:
+            if not self.authorized():
+                raise PermissionError("a valid token is needed, see 'faithwalk serve --token'")
+            body = json.loads(data) if length else None
+            status, result = 200, self.route(method, parts.path, query, body)
+        except PermissionError as error:
+            status, result = 401, {"error": str(error)}
+        except LookupError as error:
+            status, result = 404, {"error": str(error)}
+        except Exception as error:
+            status, result = 400, {"error": str(error)}
+        data = json.dumps(result).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def authorized(self) -> bool:
+        """
+        Check the request's token against the server's, every request is allowed when the server has none
+        """
+        token = self.server.token
+        if not token:
+            return True
+        # compare_digest takes as long for a wrong first character as a wrong last one
+        return hmac.compare_digest(self.headers.get("Authorization", "").encode(), f"Bearer {token}".encode())
+
+    def route(self, method: str, path: str, query: dict[str, str], body: Any) -> Any:
+        """
+        Run the database call for a request and get what to send back
+        """
+        pool = self.server.pool
+        entry_filter = EntryFilter(query.get("name", ""), query.get("date", ""), query.get("book", ""), query.get("text", ""))
+        match (method, path):
+            case ("GET", "/entries"):
+                return pool.read(get_entries_page, int(query.get("after", -1)), int(query.get("limit", 100)), entry_filter)
+            case ("GET", "/entries/sorted"):
+                entry_sort = EntrySort(query.get("sort", "id"), query.get("descending") == "1")
+                after = tuple(json.loads(query["after"])) if "after" in query else None
+                return pool.read(get_entries_sorted, entry_sort, after, int(query.get("limit", 100)), entry_filter)
+            case ("POST", "/entries"):
+                return pool.write(add_entry, body)
+            case ("POST", "/entries/batch"):
+                return pool.write(add_entries, body)
+            case ("PUT", "/entries/batch"):
+                return pool.write(edit_entries, body)
+            case ("POST", "/entries/bulk"):
+                return pool.write(bulk_add_entries, body)
+            case ("POST", "/entries/delete"):
+                return pool.write(delete_entries, body)
+            case ("POST", "/entries/lookup"):
+                return pool.read(get_entries_by_ids, body)
+            case ("GET", "/changes"):
+                return pool.read(get_changes, int(query.get("since", 0)), entry_filter)
+            case ("GET", "/changes/last"):
+                return pool.read("last_change_id")
+            case ("GET", "/stats/people"):
+                return pool.read("minutes_per_person")
+            case ("GET", "/stats/books"):
+                return pool.read("minutes_per_book")
+            case ("GET", "/stats/streaks"):
+                return pool.read("reading_streaks")
+            case ("GET", "/stats/daily"):
+                return pool.read("daily_totals", int(query.get("days", 30)))
+            case ("GET", "/stats/weekly"):
+                return pool.read("weekly_totals", int(query.get("weeks", 12)))
+            case ("GET", "/import-progress"):
+                return pool.read("get_import_progress", query["source"])
+            case ("PUT", "/import-progress"):
+                return pool.write("set_import_progress", body["source"], int(body["rows_done"]))
+            case ("POST", "/edits"):
+                return pool.write(apply_edit, body)
+            case ("POST", "/edits/delete"):
+                return pool.write(apply_deletes, body)
+            case ("GET", "/edits"):
+                return pool.read(get_edit_journal, query["slot"], int(query.get("limit", 1000)))
+            case ("GET", "/drafts"):
+                return pool.read(get_draft, query["slot"])
+            case ("PUT", "/drafts"):
+                return pool.write(save_draft, body["slot"], body["draft"])
+            case ("DELETE", "/drafts"):
+                return pool.write("delete_draft", query["slot"])
+            case ("GET", "/schema-version"):
+                return pool.read("schema_version")
+        entry_path = re.fullmatch(r"/entries/(\d+)", path)
+        if entry_path and method == "GET":
+            return pool.read(get_entry, int(entry_path.group(1)))
+        if entry_path and method == "PUT":
+            return pool.write(edit_entry, int(entry_path.group(1)), body)
+        if entry_path and method == "DELETE":
+            return pool.write("delete_entry", int(entry_path.group(1)))
+        raise LookupError(f"no such request: {method} {path}")
+
+    def log_message(self, format: str, *args) -> None:
+        # one line per request would make stderr the bottleneck under load
+        if self.server.log_requests:
+            super().log_message(format, *args)
+
+class JournalServer(ThreadingHTTPServer):
+    # don't wait for open client connections when shutting down
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], pool: ConnectionPool, log_requests: bool = False, token: str | None = None) -> None:
+        """
+        Serve a ConnectionPool, each client connection gets its own thread.
+        With a 'token', only requests sending it in an "Authorization: Bearer" header are answered.
+        """
+        super().__init__(address, JournalRequestHandler)
+        self.pool: ConnectionPool = pool
+        self.log_requests: bool = log_requests
+        self.token: str | None = token
+
+def is_loopback(host: str) -> bool:
+    """
+    Whether only this computer can reach an address
+    """
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+def serve(profile: ConnectionProfile = PRODUCTION_PROFILE, host: str = "127.0.0.1", port: int = 8765, readers: int = 4, log_requests: bool = False,
+        profiler: "Profiler | None" = None, token: str | None = None) -> None:
+    """
+    Share a database until interrupted, port 0 picks a free port.
+    Listening on anything but this computer needs a 'token', otherwise anyone on the network could change the journal.
+    """
+    if not token and not is_loopback(host):
+        raise Exception(f"Server error: listening on {host} needs a --token, without one anyone who can reach it can read and change the journal")
+    pool = ConnectionPool(profile, readers, profiler)
+    # the change log only has to cover clients that are running now
+    pool.write("prune_change_log")
+    server = JournalServer((host, port), pool, log_requests, token)
+    print(f"Serving {profile.path} on http://{host}:{server.server_address[1]}", file=sys.stderr, flush=True)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.close()
@@ -0,0 +1,38 @@
+"""
+Window settings kept between sessions, like the sort order of the View tab.
+They are stored per journal in a JSON file in the home directory, so a shared journal doesn't force one person's choices on everyone.
+"""
+import json
+import os
+
+SETTINGS_PATH: str = os.path.join(os.path.expanduser("~"), ".faithwalk.json")
+
+def load_settings(journal: str, path: str = SETTINGS_PATH) -> dict:
+    """
+    Get the settings saved for a journal, a database path or server address, or {} if there are none
+    """
+    try:
+        with open(path, encoding="utf-8") as file:
+            settings = json.load(file)
+    except (OSError, ValueError):
+        return {}
+    journal_settings = settings.get(journal) if isinstance(settings, dict) else None
+    return journal_settings if isinstance(journal_settings, dict) else {}
+
+def save_settings(journal: str, journal_settings: dict, path: str = SETTINGS_PATH) -> None:
+    """
+    Replace the settings saved for a journal, the settings of other journals are kept
+    """
+    try:
+        with open(path, encoding="utf-8") as file:
+            settings = json.load(file)
+        if not isinstance(settings, dict):
+            settings = {}
+    except (OSError, ValueError):
+        settings = {}
+    settings[journal] = journal_settings
+    # write a new file and swap it in, so a crash can't leave half a file behind
+    temporary_path = path + ".tmp"
+    with open(temporary_path, "w", encoding="utf-8") as file:
+        json.dump(settings, file, indent=2)
+    os.replace(temporary_path, path)
@@ -0,0 +1,150 @@
+"""
+Streaming import and export of entries as CSV or JSON Lines
+"""
+import collections
+import csv
+import itertools
+import json
+import operator
+import os
+import sys
+import time
+from typing import Callable, Iterator
+
+from faithwalk.database import DatabaseConnection
+from faithwalk.entry import Entry
+
+# column names used for CSV headers and JSON Lines keys
+TRANSFER_FIELDS: tuple[str, ...] = ("id", "name", "date", "book", "event", "verse", "minutes", "action")
+
+def transfer_format(path: str, file_format: str | None = None) -> str:
+    """
+    Get "csv" or "jsonl" from a format name, or from the file extension if no name is given
+    """
+    if not file_format and path == "-":
+        file_format = "csv"
+    file_format = (file_format or os.path.splitext(path)[1].lstrip(".")).lower()
+    if file_format in ("jsonl", "ndjson", "json"):
+        return "jsonl"
+    if file_format == "csv":
+        return "csv"
+    raise Exception(f"Transfer error: unknown format '{file_format}', use csv or jsonl")
+
+def read_records(file, file_format: str) -> Iterator[Entry]:
+    """
+    Stream the records of a CSV or JSON Lines file as entries, an "id" in a record is ignored
+    """
+    fields = TRANSFER_FIELDS[1:]
+    if file_format == "csv":
+        reader = csv.reader(file)
+        header = next(reader, None)
+        if header is None:
+            return
+        header = [column.strip().lower() for column in header]
+        missing = [field for field in fields if field not in header]
+        if missing:
+            raise Exception(f"Import error: CSV header is missing {', '.join(missing)}")
+        # pick the columns out of each row in Entry order without building a dictionary per row
+        columns = [header.index(field) for field in fields]
+        pick_columns = operator.itemgetter(*columns)
+        needed = max(columns) + 1
+        for row in reader:
+            if not row:
+                continue
+            # the chunk being read isn't committed, running the import again carries on from the last committed one
+            if len(row) < needed:
+                raise Exception(f"Import error: line {reader.line_num} has {len(row)} columns, the header has {len(header)}")
+            yield Entry(*pick_columns(row))
+    else:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as error:
+                raise Exception(f"Import error: line {line_number} isn't JSON: {error}")
+            if not isinstance(record, dict):
+                raise Exception(f"Import error: line {line_number} isn't a JSON object")
+            yield record_entry(record)
+
+def record_entry(record: dict) -> Entry:
+    """
+    Turn a JSON record into a new entry, an "id" in the record is ignored
+    """
+    if not isinstance(record, dict):
+        raise Exception(f"Record error: expected a JSON object, got {type(record).__name__}")
+    # numbers are allowed for minutes, everything else has to be text for Entry.normalize
+    return Entry(*(value if type(value) is str or (field == "minutes" and type(value) is int) else "" if value is None else str(value)
+        for field, value in zip(TRANSFER_FIELDS[1:], (record.get(field) for field in TRANSFER_FIELDS[1:]))))
+
+def entry_record(entry: Entry) -> dict:
+    """
+    Turn an entry into a JSON record, keyed by TRANSFER_FIELDS
+    """
+    return dict(zip(TRANSFER_FIELDS, (entry.id, *entry.values())))
+
+def record_to_entry(record: dict) -> Entry:
+    """
+    Turn a record made by entry_record back into the entry it was made from, id and values as they were
+    """
+    return Entry.from_row([record[field] for field in TRANSFER_FIELDS])
+
+def import_entries(database: DatabaseConnection, path: str, file_format: str | None = None, chunk_size: int = 20000, restart: bool = False,
+        on_progress: Callable[[int], None] | None = None) -> tuple[int, float]:
+    """
+    Stream a CSV or JSON Lines file into the database, committing every 'chunk_size' rows.
+    The number of rows committed is stored with each chunk, so running the same import again after a failure
+    carries on after the last committed row. 'restart' imports the whole file again.
+    A file that was changed since, or a new file written to the same path, is imported from the start.
+    Returns (rows imported, seconds taken).
+    """
+    file_format = transfer_format(path, file_format)
+    imported = 0
+    start = time.perf_counter()
+    with open(path, newline="", encoding="utf-8") as file:
+        # progress is kept per version of the file, the path alone would skip rows of whatever is written there next
+        stat = os.fstat(file.fileno())
+        source = f"{os.path.realpath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+        rows_done = 0 if restart else database.get_import_progress(source)
+        records = read_records(file, file_format)
+        # skip the rows a previous run already committed
+        collections.deque(itertools.islice(records, rows_done), maxlen=0)
+        while True:
+            chunk = list(itertools.islice(records, chunk_size))
+            if not chunk:
+                break
+            # the rows and the progress are committed together
+            with database.bulk_load():
+                database.add_entries(chunk)
+                rows_done += len(chunk)
+                database.set_import_progress(source, rows_done)
+            imported += len(chunk)
+            if on_progress:
+                on_progress(rows_done)
+    return imported, time.perf_counter() - start
+
+def export_entries(database: DatabaseConnection, path: str, file_format: str | None = None, on_progress: Callable[[int], None] | None = None) -> tuple[int, float]:
+    """
+    Stream every entry into a CSV or JSON Lines file, '-' writes to standard output.
+    Returns (rows exported, seconds taken).
+    """
+    file_format = transfer_format(path, file_format)
+    exported = 0
+    start = time.perf_counter()
+    file = sys.stdout if path == "-" else open(path, "w", newline="", encoding="utf-8")
+    try:
+        if file_format == "csv":
+            writer = csv.writer(file)
+            writer.writerow(TRANSFER_FIELDS)
+        for entry in database.iter_entries(batch_size=5000):
+            if file_format == "csv":
+                writer.writerow((entry.id, *entry.values()))
+            else:
+                file.write(json.dumps(entry_record(entry), ensure_ascii=False) + "\n")
+            exported += 1
+            if on_progress and exported % 100000 == 0:
+                on_progress(exported)
+    finally:
+        if file is not sys.stdout:
+            file.close()
+    return exported, time.perf_counter() - start
@@ -0,0 +1,75 @@
+"""
+Background thread that owns a database connection
+"""
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable
+
+from faithwalk.database import PRODUCTION_PROFILE, ConnectionProfile, DatabaseConnection
+
+class DatabaseWorker:
+    """
+    Runs DatabaseConnection calls on a background thread, so the Tk mainloop never waits on SQLite.
+    Calls are queued and run one at a time in the order they were submitted.
+    """
+    def __init__(self, profile: ConnectionProfile = PRODUCTION_PROFILE, open_database: Callable[[ConnectionProfile], Any] = DatabaseConnection) -> None:
+        """
+        'open_database' makes the connection from the profile, e.g. to use a RemoteDatabase instead of the file
+        """
+        self.requests: queue.Queue = queue.Queue()
+        # the connection is opened on the worker thread, sqlite3 connections stay on the thread that made them
+        self.thread = threading.Thread(target=self.run, args=(profile, open_database), name="DatabaseWorker", daemon=True)
+        self.thread.start()
+
+    def run(self, profile: ConnectionProfile, open_database: Callable[[ConnectionProfile], Any]) -> None:
+        """
+        Body of the worker thread
+        """
+        database: DatabaseConnection | Any = None
+        open_error: BaseException | None = None
+        try:
+            database = open_database(profile)
+        except BaseException as error:
+            # report the error through every request instead of dying silently
+            open_error = error
+
+        while True:
+            request = self.requests.get()
+            if request is None:
+                break
+            future, function, args, kwargs = request
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                if open_error:
+                    raise open_error
+                # a method name is looked up on the connection, a function gets the connection as its first argument
+                if isinstance(function, str):
+                    result = getattr(database, function)(*args, **kwargs)
+                else:
+                    result = function(database, *args, **kwargs)
+            except BaseException as error:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+        if database and database.connection:
+            # keep anything written outside a transaction() block, drafts saved just before closing included
+            database.disconnect(commit=True)
+
+    def submit(self, function: str | Callable[..., Any], *args, **kwargs) -> Future:
+        """
+        Queue a call and get a Future for its result.
+        'function' is either the name of a DatabaseConnection method or a function taking the connection first.
+        """
+        future: Future = Future()
+        self.requests.put((future, function, args, kwargs))
+        return future
+
+    def stop(self) -> None:
+        """
+        Finish the queued calls, close the connection and end the thread
+        """
+        self.requests.put(None)
+        self.thread.join()
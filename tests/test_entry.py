@@ -0,0 +1,63 @@
+"""
+Reading typed-in minutes, and keeping what can't be read through the typed-columns migration
+"""
+import sqlite3
+import unittest
+
+from faithwalk.entry import parse_minutes
+from faithwalk.schema import MIGRATIONS, convert_column_types
+
+class ParseMinutesTest(unittest.TestCase):
+    def test_supported_forms(self) -> None:
+        for text, minutes in [("22", 22), (" 45 ", 45), ("22 min", 22), ("22minutes", 22), ("1 hour", 60), ("1.5 hours", 90), ("2h", 120), ("3 HRS", 180)]:
+            with self.subTest(text=text):
+                self.assertEqual(parse_minutes(text), minutes)
+
+    def test_other_text_is_kept(self) -> None:
+        for text in ["1 hour 30 minutes", "1:30", "90 seconds", "2 chapters", "1,5 hours", "20-30", "1.5", "about 20"]:
+            with self.subTest(text=text):
+                self.assertEqual(parse_minutes(f"  {text} "), text)
+
+    def test_empty_and_numbers(self) -> None:
+        self.assertIsNone(parse_minutes(""))
+        self.assertIsNone(parse_minutes(None))
+        self.assertEqual(parse_minutes(30), 30)
+
+class ConvertColumnTypesTest(unittest.TestCase):
+    def test_typed_text_survives(self) -> None:
+        connection = sqlite3.connect(":memory:")
+        cursor = connection.cursor()
+        # a version 2 database, before the columns were typed
+        for migration in MIGRATIONS[:MIGRATIONS.index(convert_column_types)]:
+            migration(cursor)
+        typed = ["1 hour 30 minutes", "1:30", "90 seconds", "2 chapters", "1,5 hours", "20-30", "25 min"]
+        cursor.executemany("INSERT into DailyBibleReading (name_row, date_row, book_row, event_row, verse_row, time_row, action_row) VALUES ('Ann', '3/1/2024', 'John', '', '', ?, '')",
+            [(text,) for text in typed]
+        )
+        convert_column_types(cursor)
+        rows = cursor.execute("SELECT time_row, date_row FROM DailyBibleReading ORDER BY id").fetchall()
+        self.assertEqual([row[0] for row in rows], typed[:-1] + [25])
+        self.assertEqual({row[1] for row in rows}, {"2024-03-01"})
+
+    def test_null_columns_survive(self) -> None:
+        connection = sqlite3.connect(":memory:")
+        cursor = connection.cursor()
+        for migration in MIGRATIONS[:MIGRATIONS.index(convert_column_types)]:
+            migration(cursor)
+        cursor.execute("INSERT into DailyBibleReading (name_row, date_row, book_row, event_row, verse_row, time_row, action_row) VALUES (' Ann ', NULL, NULL, NULL, 'v', NULL, NULL)")
+        convert_column_types(cursor)
+        self.assertEqual(cursor.execute("SELECT * FROM DailyBibleReading").fetchall(), [(1, "Ann", None, None, None, "v", None, None)])
+
+    def test_deleted_ids_are_not_reused(self) -> None:
+        connection = sqlite3.connect(":memory:")
+        cursor = connection.cursor()
+        for migration in MIGRATIONS[:MIGRATIONS.index(convert_column_types)]:
+            migration(cursor)
+        cursor.executemany("INSERT into DailyBibleReading (name_row) VALUES (?)", [("A",), ("B",), ("C",)])
+        cursor.execute("DELETE FROM DailyBibleReading WHERE id = 3")
+        convert_column_types(cursor)
+        cursor.execute("INSERT into DailyBibleReading (name_row) VALUES ('D')")
+        self.assertEqual(cursor.lastrowid, 4)
+
+if __name__ == "__main__":
+    unittest.main()